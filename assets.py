@@ -0,0 +1,66 @@
+import io
+
+import pandas as pd
+import streamlit as st
+
+# =============================================================================
+# ASET STATIS (CSS + TEMPLATE EXCEL), DIBANGUN SEKALI PER PROSES
+# =============================================================================
+APP_CSS = """
+            <style>
+            #MainMenu {visibility: hidden;}
+            footer {visibility: hidden;}
+            header {visibility: hidden;}
+            [data-testid="stToolbar"] {visibility: hidden;}
+            [data-testid="stDecoration"] {display: none;}
+            .stAppDeployButton {display: none !important;}
+            div[class*="viewerBadge"] {display: none !important;}
+            .block-container {padding-top: 1rem;}
+
+            .danger-box {
+                border: 1px solid #ff4b4b;
+                padding: 10px;
+                border-radius: 5px;
+                background-color: #fff5f5;
+                color: #ff4b4b;
+            }
+            </style>
+            """
+
+# Setiap versi template = kolom wajib (dengan contoh isi) + kolom opsional (dikosongkan).
+# Tambah versi baru di sini; versi lama tetap bisa diunduh dengan nomor versinya.
+TEMPLATES = {
+    'kalender': {
+        'file_name': "Template_Kalender.xlsx",
+        'versions': {
+            1: {'columns': {
+                    "JUDUL_PELATIHAN": ["DTSS Kepabeanan", "DTSD Cukai"],
+                    "TANGGAL_MULAI": ["12/01/2026", "02/02/2026"],
+                    "TANGGAL_SELESAI": ["16/01/2026", "05/02/2026"],
+                    "LOKASI": ["Pusdiklat BC", "KPU Batam"]},
+                'optional': []},
+        },
+    },
+    'peserta': {
+        'file_name': "Template_Peserta.xlsx",
+        'versions': {
+            1: {'columns': {"JUDUL_PELATIHAN": ["DTSS Kepabeanan"], "TANGGAL_PELATIHAN": ["12-16 Jan 2026"], "TEMPAT": ["Pusdiklat"], "NO": [1], "NAMA PEGAWAI": ["Fajar"], "NIP": ["199901012024121001"], "PANGKAT": ["II/c"], "SATUAN KERJA": ["KPU Batam"]},
+                'optional': []},
+        },
+    },
+}
+
+def latest_version(kind): return max(TEMPLATES[kind]['versions'])
+
+def template_file_name(kind): return TEMPLATES[kind]['file_name']
+
+@st.cache_resource(show_spinner=False)
+def template_bytes(kind, version=None):
+    """Bytes .xlsx template `kind` (default versi terbaru). Dibuat dengan xlsxwriter sekali per proses saat pertama diunduh,
+    lalu objek bytes yang sama dipakai ulang di setiap rerun dan sesi."""
+    spec = TEMPLATES[kind]['versions'][version or latest_version(kind)]
+    df = pd.DataFrame(spec['columns'])
+    for col in spec['optional']: df[col] = ""
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf, engine='xlsxwriter') as writer: df.to_excel(writer, index=False)
+    return buf.getvalue()
@@ -0,0 +1,65 @@
+"""Benchmark tabel peserta Lampiran ND: jalur proxy python-docx vs writer XML massal vs render sharded per pelatihan.
+
+Jalankan dari root repo:
+    python benchmarks/bench_docgen.py --rows 1000 --groups 1
+    python benchmarks/bench_docgen.py --rows 20000 --groups 40 --workers 4
+"""
+import argparse
+import io
+import os
+import sys
+import time
+import zipfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from docgen import generate_word_combined  # noqa: E402
+
+
+def synthetic_roster(rows, groups):
+    return pd.DataFrame({
+        "JUDUL_PELATIHAN": [f"Pelatihan {i % groups + 1:03d}" for i in range(rows)],
+        "TANGGAL_PELATIHAN": "12-16 Jan 2026",
+        "TEMPAT": "Pusdiklat BC",
+        "NAMA": [f"Pegawai {i}" for i in range(rows)],
+        "NIP": [f"1990{i % 12 + 1:02d}01201{i % 9 + 1}12{i % 2 + 1}{i % 1000:03d}" for i in range(rows)],
+        "PANGKAT": "II/c",
+        "SATKER": [f"KPPBC {i % 40}" for i in range(rows)],
+    })
+
+
+def run(df, repeat, **kwargs):
+    best = None; data = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        data = generate_word_combined(df, "Ayu Sukorini", "Sekretaris Direktorat Jenderal", "ND-1", "1 Jan 2026", **kwargs).getvalue()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--groups", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=1, help="proses worker untuk mode sharded")
+    args = parser.parse_args()
+
+    df = synthetic_roster(args.rows, args.groups)
+    t_proxy, out_proxy = run(df, args.repeat, fast_table=False, sharded=False)
+    t_fast, out_fast = run(df, args.repeat, fast_table=True, sharded=False)
+    t_shard, out_shard = run(df, args.repeat, sharded=True, workers=args.workers)
+    doc_xml = lambda data: zipfile.ZipFile(io.BytesIO(data)).read("word/document.xml")
+    same = doc_xml(out_proxy) == doc_xml(out_fast)
+
+    print(f"{args.rows} peserta, {args.groups} pelatihan (best of {args.repeat})")
+    print(f"  proxy python-docx : {t_proxy:8.3f} s  {args.rows / t_proxy:10.0f} rows/s")
+    print(f"  writer XML massal : {t_fast:8.3f} s  {args.rows / t_fast:10.0f} rows/s")
+    print(f"  speedup           : {t_proxy / t_fast:8.1f}x   document.xml identik: {same}")
+    print(f"  sharded ({args.workers} worker) : {t_shard:8.3f} s  {args.rows / t_shard:10.0f} rows/s   identik: {doc_xml(out_shard) == doc_xml(out_fast)}")
+
+
+if __name__ == "__main__":
+    main()
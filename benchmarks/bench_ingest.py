@@ -0,0 +1,73 @@
+"""Benchmark ingesti roster: pd.read_excel(dtype=str) + pemetaan kolom vs ingest.py (header dulu,
+hanya kolom terpetakan, openpyxl read-only) dan jalur cepat CSV. Roster sintetis berisi sel kosong, dan hasilnya
+dibandingkan dengan pd.read_excel (roster dan kalender) supaya sel kosong tetap NaN, bukan None.
+
+Jalankan dari root repo:
+    python benchmarks/bench_ingest.py --rows 30000 --extra-cols 10
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ingest import _read, map_roster_column, resolve_calendar_columns, resolve_roster_columns  # noqa: E402
+
+
+def synthetic_roster(rows, extra_cols):
+    df = pd.DataFrame({
+        "JUDUL_PELATIHAN": [f"DTSS Kepabeanan {i % 20}" for i in range(rows)], "TANGGAL_PELATIHAN": ["12-16 Jan 2026"] * rows,
+        "TEMPAT": ["Pusdiklat"] * rows, "NO": range(1, rows + 1), "NAMA PEGAWAI": [f"Pegawai {i}" for i in range(rows)],
+        "NIP": [f"1999010120241210{i % 100:02d}" for i in range(rows)], "PANGKAT": [None if i % 7 == 0 else "II/c" for i in range(rows)],
+        "SATUAN KERJA": [None if i % 11 == 0 else "KPU Batam" for i in range(rows)],
+    })
+    for k in range(extra_cols): df[f"KETERANGAN_{k}"] = "catatan tambahan yang tidak dipakai"
+    return df
+
+
+def baseline(data):
+    df_raw = pd.read_excel(io.BytesIO(data), dtype=str)
+    return df_raw.rename(columns={c: map_roster_column(c) or c.strip().upper() for c in df_raw.columns})
+
+
+def calendar_matches_read_excel():
+    # Kalender dibaca tanpa dtype=str: tanggal tetap datetime, sel kosong harus NaN/NaT seperti pd.read_excel
+    cal = pd.DataFrame({"JUDUL_PELATIHAN": ["DTSS A", "DTSS B", "DTSS C"], "TANGGAL_MULAI": [pd.Timestamp("2026-01-12"), None, pd.Timestamp("2026-02-02")],
+                        "TANGGAL_SELESAI": ["16 Jan 2026", pd.Timestamp("2026-01-30"), None], "LOKASI": [None, "Jakarta", "Batam"]})
+    buf = io.BytesIO(); cal.to_excel(buf, index=False); xlsx = buf.getvalue()
+    baru = _read(xlsx, "kalender.xlsx", resolve_calendar_columns, as_str=False)
+    lama = pd.read_excel(io.BytesIO(xlsx))
+    return baru.equals(lama[list(baru.columns)]) and baru.astype(str).equals(lama[list(baru.columns)].astype(str))
+
+
+def timed(fn):
+    t0 = time.perf_counter(); out = fn(); return out, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=30_000)
+    parser.add_argument("--extra-cols", type=int, default=10)
+    args = parser.parse_args()
+    df = synthetic_roster(args.rows, args.extra_cols)
+    buf = io.BytesIO(); df.to_excel(buf, index=False); xlsx = buf.getvalue()
+    csv = df.to_csv(index=False, sep=";").encode("utf-8")
+
+    lama, t_lama = timed(lambda: baseline(xlsx))
+    baru, t_baru = timed(lambda: _read(xlsx, "roster.xlsx", resolve_roster_columns, as_str=True))
+    dari_csv, t_csv = timed(lambda: _read(csv, "roster.csv", resolve_roster_columns, as_str=True))
+
+    same = lama[list(baru.columns)].equals(baru) and dari_csv.equals(baru)
+    print(f"{args.rows} baris, {len(df.columns)} kolom (xlsx {len(xlsx) / 1e6:.1f} MB)")
+    print(f"  read_excel + rename : {t_lama:8.3f} s")
+    print(f"  ingest xlsx         : {t_baru:8.3f} s   speedup {t_lama / t_baru:5.1f}x")
+    print(f"  ingest csv          : {t_csv:8.3f} s   speedup {t_lama / t_csv:5.1f}x")
+    print(f"  kolom dibaca        : {list(baru.columns)}   hasil identik: {same}")
+    print(f"  kalender vs read_excel (sel kosong): {'identik' if calendar_matches_read_excel() else 'BERBEDA'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Benchmark konversi PDF: throughput (dokumen/detik) konversi batch soffice --convert-to di pdfconv.py,
+dibandingkan satu proses soffice per file. Startup LibreOffice tetap dibayar per batch (tidak ada instance yang
+tetap hidup); angka hanya bermakna bila dijalankan dengan LibreOffice asli.
+
+Butuh LibreOffice (soffice di PATH atau env SOFFICE_BIN). Jalankan dari root repo:
+    python benchmarks/bench_pdf.py --docs 200 --workers 2
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pdfconv  # noqa: E402
+from docgen import _zip_items, build_single_template, render_single_document  # noqa: E402
+
+
+def synthetic_docs(count):
+    df = pd.DataFrame({"JUDUL_PELATIHAN": "DTSS Kepabeanan", "TANGGAL_PELATIHAN": "12-16 Jan 2026", "TEMPAT": "Pusdiklat BC",
+                       "NAMA": [f"Pegawai {i}" for i in range(count)], "NIP": [f"19900101201{i % 9 + 1}121{i % 1000:03d}" for i in range(count)],
+                       "PANGKAT": "II/c", "SATKER": "KPU Batam"})
+    template = build_single_template("Ayu Sukorini", "Sekretaris Direktorat Jenderal", "ND-1", "1 Jan 2026")
+    return [(nama, render_single_document(template, peserta, judul, tgl, tempat)) for nama, peserta, judul, tgl, tempat in _zip_items(df)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=pdfconv.PDF_WORKERS)
+    parser.add_argument("--per-file", type=int, default=5, help="jumlah dokumen untuk pembanding satu proses per file (0 = lewati)")
+    args = parser.parse_args()
+    if not pdfconv.pdf_available(): sys.exit("LibreOffice (soffice) tidak ditemukan; set SOFFICE_BIN.")
+    pdfconv.PDF_WORKERS = args.workers
+    docs = synthetic_docs(args.docs)
+
+    t0 = time.perf_counter(); pdfconv.convert_many(docs[:1]); t_cold = time.perf_counter() - t0   # profil slot dibuat
+    t0 = time.perf_counter(); pdfs = pdfconv.convert_many(docs); t_batch = time.perf_counter() - t0
+    print(f"{args.docs} dokumen, {args.workers} soffice paralel, batch {pdfconv.PDF_BATCH}")
+    print(f"  start pertama (profil)  : {t_cold:8.2f} s")
+    print(f"  batch soffice           : {t_batch:8.2f} s  {args.docs / t_batch:8.1f} dok/s  ({sum(len(p) for _, p in pdfs) / 1e6:.1f} MB PDF)")
+    if args.per_file:
+        batch = pdfconv.PDF_BATCH; pdfconv.PDF_BATCH = 1
+        try:
+            t0 = time.perf_counter()
+            for doc in docs[:args.per_file]: pdfconv.convert_many([doc])
+            t_single = time.perf_counter() - t0
+        finally: pdfconv.PDF_BATCH = batch
+        print(f"  satu soffice per file   : {t_single:8.2f} s  {args.per_file / t_single:8.1f} dok/s  ({args.per_file} dokumen)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark cold start & latensi rerun app.py (Streamlit AppTest, tanpa browser).
+
+Setiap pengukuran dijalankan di proses Python baru: waktu import streamlit, run pertama (cold start,
+termasuk import modul app), lalu median beberapa rerun. Dicatat juga modul berat yang sudah
+ter-import setelah run pertama dan jumlah panggilan Sheets (spreadsheet palsu, GSHEET_FAKE=1).
+
+Jalankan dari root repo:
+    python benchmarks/bench_startup.py --runs 5 --reruns 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("docx", "lxml", "openpyxl", "xlsxwriter", "gspread", "oauth2client", "google.auth", "matplotlib", "sqlite3")
+
+CHILD = r"""
+import json, os, statistics, sys, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+t_import = time.perf_counter() - t0
+sys.path.insert(0, {root!r})
+at = AppTest.from_file(os.path.join({root!r}, "app.py"), default_timeout=120)
+t0 = time.perf_counter(); at.run(); t_cold = time.perf_counter() - t0
+loaded = [m for m in {heavy!r} if m in sys.modules]
+from fake_sheets import fake_spreadsheet
+calls_cold = sum(fake_spreadsheet().api_calls().values())
+rerun = []
+for _ in range({reruns}):
+    t0 = time.perf_counter(); at.run(); rerun.append(time.perf_counter() - t0)
+print(json.dumps({{"import_s": t_import, "cold_s": t_cold, "rerun_s": statistics.median(rerun), "loaded": loaded,
+                  "api_cold": calls_cold, "api_rerun": sum(fake_spreadsheet().api_calls().values()) - calls_cold,
+                  "errors": [str(e.value) for e in at.exception]}}))
+"""
+
+
+def measure(reruns):
+    tmp = tempfile.mkdtemp(prefix="bench_startup_")
+    env = dict(os.environ, GSHEET_FAKE="1", DIKLAT_DATA_DIR=os.path.join(tmp, "data"), WRITE_QUEUE_DIR=os.path.join(tmp, "queue"))
+    code = CHILD.format(root=ROOT, heavy=HEAVY_MODULES, reruns=reruns)
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT, env=env)
+    lines = [ln for ln in proc.stdout.splitlines() if ln.startswith("{")]
+    if not lines: raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "tidak ada output")
+    return json.loads(lines[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="jumlah proses baru (median diambil)")
+    parser.add_argument("--reruns", type=int, default=10, help="rerun per proses untuk latensi rerun")
+    args = parser.parse_args()
+
+    hasil = [measure(args.reruns) for _ in range(args.runs)]
+    med = lambda k: statistics.median(h[k] for h in hasil)
+    print(f"{args.runs} proses x {args.reruns} rerun (median)")
+    print(f"  import streamlit      : {med('import_s') * 1000:8.0f} ms")
+    print(f"  run pertama (cold)    : {med('cold_s') * 1000:8.0f} ms")
+    print(f"  rerun                 : {med('rerun_s') * 1000:8.1f} ms")
+    print(f"  panggilan Sheets      : {hasil[0]['api_cold']} saat cold start, {hasil[0]['api_rerun']} selama {args.reruns} rerun")
+    print(f"  modul berat ter-import: {', '.join(hasil[0]['loaded']) or '-'}")
+    if hasil[0]["errors"]: print(f"  EXCEPTION: {hasil[0]['errors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""Suite benchmark end-to-end: Lampiran, ZIP per peserta, dokumen tunggal, NIP dan sinkronisasi Sheets
+(kalender, log, status Selesai) terhadap spreadsheet palsu di memori (fake_sheets.py, tanpa jaringan).
+
+Setiap kasus (benchmark x ukuran) dijalankan di subprocess baru supaya peak RSS terukur per kasus.
+Data sintetis memakai seed tetap sehingga hasil bisa dibandingkan antar commit / deployment.
+
+Jalankan dari root repo:
+    python benchmarks/bench_suite.py                                  # preset quick
+    python benchmarks/bench_suite.py --preset full --save main        # 10 .. 50.000 peserta, 1 .. 200 pelatihan
+    python benchmarks/bench_suite.py --preset full --compare main     # bandingkan dengan baseline tersimpan
+    python benchmarks/bench_suite.py --sizes 2000x20 --bench word,sheets
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_DIR = os.path.join(ROOT, "benchmarks", "baselines")
+PRESETS = {
+    "quick": [(10, 1), (500, 5), (2000, 20)],
+    "full": [(10, 1), (1000, 10), (10000, 50), (50000, 200)],
+}
+BENCHES = ("word", "zip", "single", "nip", "sheets")
+TTD = ("Ayu Sukorini", "Sekretaris Direktorat Jenderal", "ND-1/BC.01/2026", "5 Januari 2026")
+
+
+# =============================================================================
+# DATA SINTETIS (SEED TETAP)
+# =============================================================================
+def training_titles(groups):
+    jenis = ["Teknis Kepabeanan", "Audit Cukai", "Intelijen", "Penyidikan", "Manajemen Risiko", "Pemeriksaan Barang"]
+    return [f"Pelatihan {jenis[k % len(jenis)]} Angkatan {k + 1:03d}" for k in range(groups)]
+
+
+def synthetic_roster(rows, groups, seed=0):
+    import numpy as np
+    import pandas as pd
+    from bench_nip import synthetic_nips
+    rng = np.random.default_rng(seed)
+    judul = training_titles(groups)
+    idx = np.sort(rng.integers(0, groups, rows)) if groups > 1 else np.zeros(rows, dtype=int)
+    return pd.DataFrame({
+        "JUDUL_PELATIHAN": [judul[i] for i in idx],
+        "TANGGAL_PELATIHAN": [f"{i % 28 + 1:02d} Jan 2026" for i in idx],
+        "TEMPAT": "Pusdiklat BC",
+        "NAMA": [f"Pegawai {i}" for i in range(rows)],
+        "NIP": synthetic_nips(rows, seed).tolist(),
+        "PANGKAT": [["II/a", "II/c", "III/a", "III/c", "IV/a"][i % 5] for i in range(rows)],
+        "SATKER": [f"KPPBC TMP {chr(65 + i % 3)} Kota {i % 120}" for i in range(rows)],
+    })
+
+
+def synthetic_calendar(groups, seed=0):
+    """(judul, rencana, lokasi) untuk semua pelatihan roster + separuhnya lagi pelatihan lain."""
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    judul = training_titles(groups) + [f"Workshop Lain {k:03d}" for k in range(max(1, groups // 2))]
+    bulan = rng.integers(1, 13, len(judul))
+    return [(j, f"{b:02d}-03-2026 s.d. {b:02d}-07-2026", f"Balai Diklat {k % 7}") for k, (j, b) in enumerate(zip(judul, bulan))]
+
+
+# =============================================================================
+# KASUS (DIJALANKAN DI SUBPROCESS)
+# =============================================================================
+def _peak_rss_mb():
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def _best(fn, repeat):
+    best = None; out = None
+    for _ in range(repeat):
+        t0 = time.perf_counter(); out = fn(); elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, out
+
+
+def case_word(rows, groups, args):
+    from docgen import generate_word_combined
+    df = synthetic_roster(rows, groups); base = _peak_rss_mb()
+    wall, out = _best(lambda: generate_word_combined(df, *TTD, workers=args.workers).getvalue(), args.repeat)
+    return [{"wall_s": wall, "output_bytes": len(out), "rss_base_mb": base}]
+
+
+def case_zip(rows, groups, args):
+    from docgen import generate_zip_files
+    df = synthetic_roster(rows, groups); base = _peak_rss_mb()
+    def _run():
+        arsip = generate_zip_files(df, *TTD, workers=args.workers)
+        arsip.seek(0, os.SEEK_END); return arsip.tell()
+    wall, size = _best(_run, args.repeat)
+    return [{"wall_s": wall, "output_bytes": size, "rss_base_mb": base}]
+
+
+def case_single(rows, groups, args):
+    from docgen import create_single_document
+    df = synthetic_roster(min(rows, args.single_max), groups); base = _peak_rss_mb()
+    def _run():
+        total = 0
+        for _, row in df.iterrows():
+            total += len(create_single_document(row, row["JUDUL_PELATIHAN"], row["TANGGAL_PELATIHAN"], row["TEMPAT"], *TTD).getvalue())
+        return total
+    wall, size = _best(_run, args.repeat)
+    return [{"wall_s": wall, "output_bytes": size, "rss_base_mb": base, "docs": len(df)}]
+
+
+def case_nip(rows, groups, args):
+    from nip import calculate_age_from_nip, get_gender_from_nip, parse_nip_column
+    nip = synthetic_roster(rows, groups)["NIP"]; base = _peak_rss_mb()
+    wall_col, parsed = _best(lambda: parse_nip_column(nip), args.repeat)
+    sampel = nip.iloc[:args.single_max * 10]
+    wall_row, _ = _best(lambda: (sampel.map(calculate_age_from_nip), sampel.map(get_gender_from_nip)), args.repeat)
+    return [{"phase": "parse_nip_column", "wall_s": wall_col, "rss_base_mb": base, "invalid": int((~parsed["NIP_VALID"]).sum())},
+            {"phase": "helper_per_baris", "wall_s": wall_row, "rss_base_mb": base, "docs": len(sampel)}]
+
+
+def case_sheets(rows, groups, args):
+    # Backend sheets dengan spreadsheet palsu; data lokal (mirror, antrian) ke direktori sementara
+    tmp = tempfile.mkdtemp(prefix="bench_sheets_")
+    os.environ.update(GSHEET_FAKE="1", STORAGE_MODE="sheets", DIKLAT_DATA_DIR=os.path.join(tmp, "data"),
+                      WRITE_QUEUE_DIR=os.path.join(tmp, "queue"))
+    import gsheet
+    import storage
+    from fake_sheets import fake_spreadsheet
+    from history_mirror import sync_history
+
+    df = synthetic_roster(rows, groups); calendar = synthetic_calendar(groups)
+    ubah = [(j, r.replace("-2026", "-2027"), l) if k % 10 == 0 else (j, r, l) for k, (j, r, l) in enumerate(calendar)]
+    log = [["2026-01-05 08:00:00", n, nip, j, s] for n, nip, j, s in zip(df["NAMA"], df["NIP"], df["JUDUL_PELATIHAN"], df["SATKER"])]
+    # Judul upload tidak selalu sama persis dengan kalender: sebagian huruf kecil / tanda baca berbeda
+    judul_upload = [j.lower().replace(" ", "  ") if k % 3 == 1 else j.replace("Angkatan", "Angkatan.") if k % 3 == 2 else j
+                    for k, j in enumerate(df["JUDUL_PELATIHAN"].unique().tolist())]
+    sh = fake_spreadsheet(); base = _peak_rss_mb()
+
+    def _completion():
+        hasil = storage.match_titles(judul_upload)
+        return gsheet.mark_ids_complete([h["id"] for h in hasil.values() if h["id"] is not None])
+
+    phases = [
+        ("calendar_insert", lambda: storage.upsert_calendar(calendar)),
+        ("calendar_update", lambda: storage.upsert_calendar(ubah)),
+        ("history_append", lambda: gsheet.append_history_rows(log)),
+        ("completion", _completion),
+        ("history_sync", lambda: sync_history(force=True)),
+        ("calendar_reset", gsheet.reset_calendar_status),
+    ]
+    results = []
+    for name, fn in phases:
+        before = sh.api_calls()
+        t0 = time.perf_counter(); out = fn(); wall = time.perf_counter() - t0
+        calls = sh.api_calls(); calls.subtract(before)
+        res = {"phase": name, "wall_s": wall, "rss_base_mb": base, "api_calls": {k: v for k, v in calls.items() if v}}
+        if name == "completion": res["matched"] = len(out["matched"])
+        results.append(res)
+    return results
+
+
+CASES = {"word": case_word, "zip": case_zip, "single": case_single, "nip": case_nip, "sheets": case_sheets}
+
+
+def run_case_inline(spec, args):
+    sys.path.insert(0, ROOT); sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    results = CASES[spec["bench"]](spec["rows"], spec["groups"], args)
+    peak = _peak_rss_mb()
+    for r in results:
+        r.update(bench=spec["bench"] + (f".{r.pop('phase')}" if "phase" in r else ""), rows=spec["rows"], groups=spec["groups"],
+                 rss_peak_mb=peak, wall_s=round(r["wall_s"], 4))
+        r["api_calls_total"] = sum(r.get("api_calls", {}).values())
+    return results
+
+
+def run_case(spec, args):
+    cmd = [sys.executable, os.path.abspath(__file__), "--case", json.dumps(spec), "--repeat", str(args.repeat),
+           "--workers", str(args.workers), "--single-max", str(args.single_max)]
+    proc = subprocess.run(cmd, capture_output=True, text=True, cwd=ROOT)
+    lines = [ln for ln in proc.stdout.splitlines() if ln.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        return [{"bench": spec["bench"], "rows": spec["rows"], "groups": spec["groups"], "error": proc.stderr.strip().splitlines()[-1:] or ["?"]}]
+    return [json.loads(ln) for ln in lines]
+
+
+# =============================================================================
+# BASELINE & LAPORAN
+# =============================================================================
+def _meta(args, sizes):
+    try: commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=ROOT).stdout.strip() or None
+    except OSError: commit = None
+    return {"created": datetime.datetime.now().isoformat(timespec="seconds"), "commit": commit, "python": platform.python_version(),
+            "platform": platform.platform(), "cpus": os.cpu_count(), "repeat": args.repeat, "workers": args.workers,
+            "sizes": [list(s) for s in sizes]}
+
+
+def _key(r): return (r["bench"], r["rows"], r["groups"])
+
+
+def print_results(results):
+    print(f"{'benchmark':<26}{'peserta':>8}{'pelatihan':>10}{'waktu (s)':>11}{'peak RSS MB':>13}{'output KB':>11}{'API':>6}")
+    for r in results:
+        if "error" in r:
+            print(f"{r['bench']:<26}{r['rows']:>8}{r['groups']:>10}   GAGAL: {r['error'][0]}"); continue
+        out = f"{r['output_bytes'] / 1024:>11.0f}" if "output_bytes" in r else f"{'-':>11}"
+        print(f"{r['bench']:<26}{r['rows']:>8}{r['groups']:>10}{r['wall_s']:>11.3f}{r['rss_peak_mb']:>13.1f}{out}{r['api_calls_total']:>6}")
+
+
+def compare(results, baseline, tolerance, min_delta):
+    """Cetak rasio terhadap baseline; return daftar regresi (waktu > tolerance x dan lebih lambat >= min_delta detik,
+    RSS > tolerance x, output > 5% lebih besar, atau panggilan API bertambah)."""
+    lama = {_key(r): r for r in baseline["results"] if "error" not in r}
+    regresi = []
+    print(f"\nDibanding baseline {baseline['meta'].get('commit')} ({baseline['meta'].get('created')}), toleransi waktu/RSS {tolerance:.2f}x")
+    for r in results:
+        b = lama.get(_key(r))
+        if b is None or "error" in r: continue
+        rasio = r["wall_s"] / b["wall_s"] if b["wall_s"] else 1.0
+        catatan = []
+        if rasio > tolerance and r["wall_s"] - b["wall_s"] >= min_delta: catatan.append(f"waktu {rasio:.2f}x")
+        if b["rss_peak_mb"] and r["rss_peak_mb"] / b["rss_peak_mb"] > tolerance: catatan.append(f"RSS {r['rss_peak_mb'] / b['rss_peak_mb']:.2f}x")
+        if b.get("output_bytes") and r.get("output_bytes", 0) > b["output_bytes"] * 1.05: catatan.append("output +5%")
+        if r["api_calls_total"] > b["api_calls_total"]: catatan.append(f"API {b['api_calls_total']} -> {r['api_calls_total']}")
+        print(f"  {r['bench']:<26}{r['rows']:>8}{r['groups']:>6}  {b['wall_s']:>9.3f} -> {r['wall_s']:>9.3f} s ({rasio:5.2f}x)  "
+              f"{'REGRESI: ' + ', '.join(catatan) if catatan else 'ok'}")
+        if catatan: regresi.append((_key(r), catatan))
+    return regresi
+
+
+def _baseline_path(name): return name if name.endswith(".json") else os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    parser.add_argument("--sizes", help="daftar PESERTAxPELATIHAN, mis. 10x1,1000x10 (menggantikan preset)")
+    parser.add_argument("--bench", default=",".join(BENCHES), help=f"subset dari {','.join(BENCHES)}")
+    parser.add_argument("--repeat", type=int, default=1, help="ulangan per kasus, diambil yang tercepat")
+    parser.add_argument("--workers", type=int, default=1, help="worker proses docgen (1 = deterministik, tanpa pool)")
+    parser.add_argument("--single-max", type=int, default=50, help="dokumen maksimal untuk benchmark dokumen tunggal")
+    parser.add_argument("--zip-max-rows", type=int, default=10000, help="lewati benchmark ZIP di atas jumlah peserta ini")
+    parser.add_argument("--save", metavar="NAMA", help="simpan hasil sebagai baseline (benchmarks/baselines/NAMA.json)")
+    parser.add_argument("--compare", metavar="NAMA", help="bandingkan dengan baseline tersimpan")
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    parser.add_argument("--min-delta", type=float, default=0.02, help="selisih waktu minimal (detik) agar dihitung regresi")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit code 1 jika ada regresi")
+    parser.add_argument("--json", metavar="FILE", help="tulis hasil mentah ke FILE")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        for r in run_case_inline(json.loads(args.case), args): print(json.dumps(r))
+        return
+
+    sizes = [tuple(int(x) for x in s.lower().split("x")) for s in args.sizes.split(",")] if args.sizes else PRESETS[args.preset]
+    benches = [b.strip() for b in args.bench.split(",") if b.strip()]
+    unknown = set(benches) - set(BENCHES)
+    if unknown: parser.error(f"benchmark tidak dikenal: {', '.join(sorted(unknown))}")
+
+    results = []
+    for rows, groups in sizes:
+        for bench in benches:
+            if bench == "zip" and rows > args.zip_max_rows: continue
+            print(f"... {bench} {rows} peserta / {groups} pelatihan", file=sys.stderr, flush=True)
+            results.extend(run_case({"bench": bench, "rows": rows, "groups": groups}, args))
+    print_results(results)
+
+    hasil = {"meta": _meta(args, sizes), "results": results}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f: json.dump(hasil, f, indent=1)
+    if args.save:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(_baseline_path(args.save), "w", encoding="utf-8") as f: json.dump(hasil, f, indent=1)
+        print(f"\nBaseline disimpan: {_baseline_path(args.save)}")
+    if args.compare:
+        with open(_baseline_path(args.compare), encoding="utf-8") as f: regresi = compare(results, json.load(f), args.tolerance, args.min_delta)
+        if regresi and args.fail_on_regression: sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
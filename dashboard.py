@@ -0,0 +1,57 @@
+import pandas as pd
+import streamlit as st
+
+# =============================================================================
+# AGREGAT DASHBOARD (DIHITUNG SEKALI PER VERSI DATA, DI-CACHE BERDASARKAN HASH ISI)
+# =============================================================================
+GENDER_COLORS = {"Pria": "#3498DB", "Wanita": "#E91E63", "Tidak Diketahui": "#95A5A6"}
+TOP_N = 15   # batang maksimal untuk breakdown SATKER/PANGKAT; sisanya digabung ke "Lainnya"
+
+def _counts(series, top_n=None):
+    counts = series.dropna().astype(str).str.strip()
+    counts = counts[counts.ne("") & counts.ne("-")].value_counts()
+    if top_n and len(counts) > top_n:
+        counts = pd.concat([counts.iloc[:top_n], pd.Series({"Lainnya": counts.iloc[top_n:].sum()})])
+    return counts.rename_axis('KATEGORI').reset_index(name='JUMLAH')
+
+def dashboard_aggregates(df):
+    """Semua angka & tabel tab Dashboard dalam satu kali lewat data. Dikembalikan sebagai dict berisi
+    metrik skalar dan DataFrame hitungan (USIA, GENDER, SATKER, PANGKAT) siap dipakai chart native.
+    Di-cache per digest penuh isi data (ingest.frame_digest), bukan hash sampel bawaan Streamlit."""
+    from ingest import frame_digest   # ingest sudah ter-import oleh tab Generator saat ada file
+    return _aggregates(frame_digest(df), df)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _aggregates(df_key, _df):
+    df = _df
+    usia = pd.to_numeric(df['USIA'], errors='coerce').dropna() if 'USIA' in df.columns else pd.Series(dtype=float)
+    return {
+        'total': len(df),
+        'pelatihan': df['JUDUL_PELATIHAN'].nunique() if 'JUDUL_PELATIHAN' in df.columns else 0,
+        'avg_usia': usia.mean() if len(usia) else None,
+        'satker': df['SATKER'].nunique() if 'SATKER' in df.columns else 0,
+        'usia_counts': usia.astype(int).value_counts().sort_index().rename('Peserta') if len(usia) else None,
+        'gender_counts': _counts(df['GENDER']) if 'GENDER' in df.columns else None,
+        'satker_counts': _counts(df['SATKER'], TOP_N) if 'SATKER' in df.columns else None,
+        'pangkat_counts': _counts(df['PANGKAT'], TOP_N) if 'PANGKAT' in df.columns else None,
+    }
+
+# --- SPESIFIKASI VEGA-LITE (DIRENDER DI BROWSER, TANPA MATPLOTLIB) ---
+def gender_pie_spec():
+    return {
+        'mark': {'type': 'arc', 'innerRadius': 0, 'tooltip': True},
+        'encoding': {
+            'theta': {'field': 'JUMLAH', 'type': 'quantitative', 'stack': 'normalize'},
+            'color': {'field': 'KATEGORI', 'type': 'nominal', 'title': 'Gender',
+                      'scale': {'domain': list(GENDER_COLORS), 'range': list(GENDER_COLORS.values())}},
+        },
+    }
+
+def breakdown_bar_spec(title, color="#3498DB"):
+    return {
+        'mark': {'type': 'bar', 'color': color, 'tooltip': True},
+        'encoding': {
+            'y': {'field': 'KATEGORI', 'type': 'nominal', 'title': title, 'sort': '-x'},
+            'x': {'field': 'JUMLAH', 'type': 'quantitative', 'title': 'Peserta'},
+        },
+    }
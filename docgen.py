@@ -0,0 +1,394 @@
+import io
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from xml.sax.saxutils import escape as xml_escape
+
+from docx import Document
+from docx.shared import Pt, Cm, Mm, RGBColor
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.enum.table import WD_ALIGN_VERTICAL, WD_TABLE_ALIGNMENT
+from docx.oxml import OxmlElement, parse_xml
+from docx.oxml.ns import nsdecls, qn
+from lxml import etree
+
+from perf import timed
+
+# =============================================================================
+# WORD GENERATOR (A4 + HEADER 8PT + SINGLE TTD)
+# =============================================================================
+def set_repeat_table_header(row):
+    tr = row._tr; trPr = tr.get_or_add_trPr(); tblHeader = OxmlElement('w:tblHeader'); tblHeader.set(qn('w:val'), "true"); trPr.append(tblHeader)
+
+# --- FUNGSI WORD SINGLE (ZIP) ---
+def create_single_document(row, judul, tgl_pel, tempat_pel, nama_ttd, jabatan_ttd, no_nd_val, tgl_nd_val):
+    doc = _build_single_document(row, judul, tgl_pel, tempat_pel, nama_ttd, jabatan_ttd, no_nd_val, tgl_nd_val)
+    f_out = io.BytesIO(); doc.save(f_out); f_out.seek(0); return f_out
+
+def _build_single_document(row, judul, tgl_pel, tempat_pel, nama_ttd, jabatan_ttd, no_nd_val, tgl_nd_val):
+    JENIS_FONT = 'Arial'; UKURAN_FONT = 11
+    doc = Document(); style = doc.styles['Normal']; style.font.name = JENIS_FONT; style.font.size = Pt(UKURAN_FONT)
+    section = doc.sections[0]
+    section.page_width = Mm(210); section.page_height = Mm(297)
+    section.top_margin = Cm(2.5); section.bottom_margin = Cm(2.5)
+    section.left_margin = Cm(3.0); section.right_margin = Cm(2.5)
+
+    header_table = doc.add_table(rows=4, cols=3); header_table.alignment = WD_TABLE_ALIGNMENT.RIGHT 
+    header_table.columns[0].width = Cm(2.0); header_table.columns[2].width = Cm(5.0)
+    
+    # UPDATE: DEFAULT SIZE 8
+    def isi_sel(r, c, text, size=8, bold=False):
+        cell = header_table.cell(r, c); p = cell.paragraphs[0]; p.paragraph_format.space_after = Pt(0)
+        run = p.add_run(text); run.font.name = JENIS_FONT; run.font.size = Pt(size); run.bold = bold
+    
+    isi_sel(0, 0, "LAMPIRAN II"); header_table.cell(0, 2).merge(header_table.cell(0, 0))
+    isi_sel(1, 0, f"Nota Dinas {jabatan_ttd}"); header_table.cell(1, 2).merge(header_table.cell(1, 0))
+    isi_sel(2, 0, "Nomor"); isi_sel(2, 1, ":"); isi_sel(2, 2, str(no_nd_val))
+    isi_sel(3, 0, "Tanggal"); isi_sel(3, 1, ":"); isi_sel(3, 2, str(tgl_nd_val))
+    
+    doc.add_paragraph(""); p = doc.add_paragraph("DAFTAR PESERTA PELATIHAN"); p.alignment = WD_ALIGN_PARAGRAPH.CENTER; p.runs[0].bold = True
+    info_table = doc.add_table(rows=3, cols=3); 
+    infos = [("Nama Pelatihan", judul), ("Tanggal", tgl_pel), ("Lokasi", tempat_pel)]
+    for r, (l, v) in enumerate(infos): info_table.cell(r,0).text = l; info_table.cell(r,1).text = ":"; info_table.cell(r,2).text = str(v)
+    
+    doc.add_paragraph(""); table = doc.add_table(rows=2, cols=5); table.style = 'Table Grid'
+    headers = ['NO', 'NAMA PEGAWAI', 'NIP', 'PANGKAT - GOL', 'SATUAN KERJA']; widths = [Cm(1.0), Cm(5.0), Cm(3.8), Cm(3.5), Cm(3.5)]
+    for i in range(5): 
+        table.rows[0].cells[i].text = headers[i]; table.rows[0].cells[i].width = widths[i]; table.rows[0].cells[i].paragraphs[0].runs[0].bold = True
+    
+    vals = ["1", row.get('NAMA','-'), row.get('NIP','-'), row.get('PANGKAT','-'), row.get('SATKER','-')]
+    for i in range(5): table.rows[1].cells[i].text = str(vals[i])
+    
+    doc.add_paragraph("")
+    ttd_table = doc.add_table(rows=1, cols=2); ttd_table.autofit = False
+    ttd_table.columns[0].width = Cm(8.0); ttd_table.columns[1].width = Cm(7.5)
+    
+    p = ttd_table.cell(0, 1).paragraphs[0]
+    p.alignment = WD_ALIGN_PARAGRAPH.LEFT
+    p.add_run(f"{jabatan_ttd},"); p.add_run("\n\n\n\n\n\n") 
+    run_elec = p.add_run("Ditandatangani secara elektronik")
+    run_elec.font.size = Pt(10); run_elec.font.color.rgb = RGBColor(160, 160, 160)
+    p.add_run(f"\n{nama_ttd}")
+    return doc
+
+# --- ENGINE TEMPLATE (KERANGKA DIRENDER SEKALI PER BATCH, PESERTA DIISI LANGSUNG KE XML) ---
+SLOT_FIELDS = ['JUDUL', 'TANGGAL', 'LOKASI', 'NAMA', 'NIP', 'PANGKAT', 'SATKER']
+_XML_INVALID = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+
+def _slot(field): return f"@@SLOT_{field}@@"
+
+def _run_xml(text):
+    """Elemen <w:r> untuk text, identik dengan setter .text python-docx (tab -> w:tab, newline -> w:br)."""
+    if _XML_INVALID.search(text): raise ValueError("All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters")
+    out = []
+    for i, chunk in enumerate(re.split('([\t\r\n])', text)):
+        if i % 2: out.append('<w:tab/>' if chunk == '\t' else '<w:br/>')
+        elif chunk:
+            space = ' xml:space="preserve"' if len(chunk.strip()) < len(chunk) else ''
+            out.append(f'<w:t{space}>{xml_escape(chunk)}</w:t>')
+    return f"<w:r>{''.join(out)}</w:r>" if out else "<w:r/>"
+
+def build_single_template(nama_ttd, jabatan_ttd, no_nd_val, tgl_nd_val):
+    """Render kerangka dokumen peserta (header, info, tabel, TTD) sekali per batch.
+    Hasilnya dipakai render_single_document() untuk tiap peserta tanpa membangun ulang Document()."""
+    row = {k: _slot(k) for k in ('NAMA', 'NIP', 'PANGKAT', 'SATKER')}
+    doc = _build_single_document(row, _slot('JUDUL'), _slot('TANGGAL'), _slot('LOKASI'), nama_ttd, jabatan_ttd, no_nd_val, tgl_nd_val)
+    buf = io.BytesIO(); doc.save(buf)
+    with zipfile.ZipFile(buf) as zf: parts = [(info.filename, zf.read(info.filename)) for info in zf.infolist()]
+
+    doc_xml = dict(parts)['word/document.xml'].decode('utf-8')
+    pattern = '|'.join(re.escape(_run_xml(_slot(f))) for f in SLOT_FIELDS)
+    pieces = re.split(f"({pattern})", doc_xml)
+    segments = pieces[0::2]; slots = [p[len('<w:r><w:t>@@SLOT_'):-len('@@</w:t></w:r>')] for p in pieces[1::2]]
+    if sorted(slots) != sorted(SLOT_FIELDS): raise ValueError("Kerangka dokumen tidak valid: slot peserta tidak lengkap.")
+    return {'parts': parts, 'segments': segments, 'slots': slots}
+
+def render_single_document(template, row, judul, tgl_pel, tempat_pel):
+    """Bytes DOCX satu peserta dari kerangka build_single_template(); isi sama dengan create_single_document()."""
+    values = {'JUDUL': judul, 'TANGGAL': tgl_pel, 'LOKASI': tempat_pel, 'NAMA': row.get('NAMA','-'),
+              'NIP': row.get('NIP','-'), 'PANGKAT': row.get('PANGKAT','-'), 'SATKER': row.get('SATKER','-')}
+    segments = template['segments']; xml = [segments[0]]
+    for slot, seg in zip(template['slots'], segments[1:]): xml.append(_run_xml(str(values[slot]))); xml.append(seg)
+    doc_xml = ''.join(xml).encode('utf-8')
+
+    f_out = io.BytesIO()
+    with zipfile.ZipFile(f_out, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, blob in template['parts']: zf.writestr(name, doc_xml if name == 'word/document.xml' else blob)
+    return f_out.getvalue()
+
+# --- TABEL PESERTA MASSAL (SEMUA w:tr SATU GRUP DIRAKIT SEKALI LEWAT XML) ---
+PESERTA_COLS = ['NAMA', 'NIP', 'PANGKAT', 'SATKER']
+
+def _row_xml_template(table, widths):
+    # Satu baris contoh dibuat lewat python-docx (lebar, vAlign, teks slot) lalu dipecah jadi segmen XML
+    row_cells = table.add_row().cells
+    for k in range(5):
+        row_cells[k].width = widths[k]; row_cells[k].text = _slot(f"COL{k}")
+        row_cells[k].vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+    tr = table.rows[-1]._tr; tr.getparent().remove(tr)
+    tr_xml = re.sub(r' xmlns:\w+="[^"]*"', '', etree.tostring(tr, encoding='unicode'))
+    pieces = re.split('(' + '|'.join(re.escape(_run_xml(_slot(f"COL{k}"))) for k in range(5)) + ')', tr_xml)
+    if len(pieces) != 11: raise ValueError("Template baris tabel tidak valid.")
+    return pieces[0::2]
+
+def fill_participant_rows(table, group, widths):
+    """Tambah satu baris per peserta (NO, NAMA, NIP, PANGKAT, SATKER) ke table dalam satu kali parse XML.
+    Hasil identik dengan add_row() + set .width/.text/vertical_alignment per sel, jauh lebih cepat untuk grup besar."""
+    if group.empty: return
+    segments = _row_xml_template(table, widths)
+    values = group.values; columns = list(group.columns)
+    col_idx = [columns.index(c) if c in columns else None for c in PESERTA_COLS]
+    rows_xml = []
+    for i, vals in enumerate(values, start=1):
+        cells = [str(i)] + [str(vals[j]) if j is not None else '-' for j in col_idx]
+        rows_xml.append(segments[0])
+        for k in range(5): rows_xml.append(_run_xml(cells[k])); rows_xml.append(segments[k + 1])
+    wrapper = parse_xml(f"<w:tbl {nsdecls('w')}>{''.join(rows_xml)}</w:tbl>")
+    table._tbl.extend(list(wrapper))
+
+# --- FUNGSI WORD COMBINED (FIXED HEADER & NUMBERING) ---
+def _setup_lampiran_page(doc):
+    JENIS_FONT = 'Arial'; UKURAN_FONT = 11
+    style = doc.styles['Normal']; style.font.name = JENIS_FONT; style.font.size = Pt(UKURAN_FONT)
+    
+    section = doc.sections[0]
+    section.page_width = Mm(210); section.page_height = Mm(297)
+    section.top_margin = Cm(2.5); section.bottom_margin = Cm(2.5)
+    section.left_margin = Cm(3.0); section.right_margin = Cm(2.5)
+    return section
+
+def _add_lampiran_header(doc, jabatan_ttd, no_nd_val, tgl_nd_val):
+    JENIS_FONT = 'Arial'; section = _setup_lampiran_page(doc)
+    p_foot = section.footer.paragraphs[0]; p_foot.alignment = WD_ALIGN_PARAGRAPH.CENTER; run = p_foot.add_run(); run._r.append(OxmlElement('w:fldChar')); run._r[-1].set(qn('w:fldCharType'), 'begin'); run._r.append(OxmlElement('w:instrText')); run._r[-1].text = "PAGE"; run._r.append(OxmlElement('w:fldChar')); run._r[-1].set(qn('w:fldCharType'), 'end')
+    
+    # --- HEADER SEKALI SAJA (SEMUA FONT 8) ---
+    header_table = doc.add_table(rows=4, cols=3); header_table.alignment = WD_TABLE_ALIGNMENT.RIGHT 
+    header_table.columns[0].width = Cm(2.0); header_table.columns[2].width = Cm(5.0)
+    
+    def isi_sel(r, c, text, size=8, bold=False): # DEFAULT SIZE 8
+        cell = header_table.cell(r, c); p = cell.paragraphs[0]; p.paragraph_format.space_after = Pt(0)
+        run = p.add_run(text); run.font.name = JENIS_FONT; run.font.size = Pt(size); run.bold = bold
+    
+    isi_sel(0, 0, "LAMPIRAN II"); header_table.cell(0, 2).merge(header_table.cell(0, 0))
+    isi_sel(1, 0, f"Nota Dinas {jabatan_ttd}"); header_table.cell(1, 2).merge(header_table.cell(1, 0))
+    isi_sel(2, 0, "Nomor"); isi_sel(2, 1, ":"); isi_sel(2, 2, str(no_nd_val))
+    isi_sel(3, 0, "Tanggal"); isi_sel(3, 1, ":"); isi_sel(3, 2, str(tgl_nd_val))
+
+def _add_group_block(doc, judul, group, fast_table=True):
+    first = group.iloc[0]
+    
+    doc.add_paragraph("")
+    p = doc.add_paragraph("DAFTAR PESERTA PELATIHAN"); p.alignment = WD_ALIGN_PARAGRAPH.CENTER; p.runs[0].bold = True
+    
+    info_table = doc.add_table(rows=3, cols=3); info_table.autofit = False
+    info_table.columns[0].width = Cm(4.0); info_table.columns[1].width = Cm(0.5); info_table.columns[2].width = Cm(11.0)
+    infos = [("Nama Pelatihan", judul), ("Tanggal", first.get('TANGGAL_PELATIHAN','-')), ("Lokasi", first.get('TEMPAT','-'))]
+    for r, (l, v) in enumerate(infos): info_table.cell(r,0).text = l; info_table.cell(r,1).text = ":"; info_table.cell(r,2).text = str(v)
+    
+    doc.add_paragraph("")
+    table = doc.add_table(rows=1, cols=5); table.style = 'Table Grid'; table.autofit = False
+    widths = [Cm(1.0), Cm(5.0), Cm(4.0), Cm(2.5), Cm(3.0)]
+    
+    hdr_cells = table.rows[0].cells; set_repeat_table_header(table.rows[0])
+    headers = ['NO', 'NAMA PEGAWAI', 'NIP', 'PANGKAT', 'UNIT KERJA']
+    for i in range(5): 
+        hdr_cells[i].width = widths[i]
+        p = hdr_cells[i].paragraphs[0]; p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        run = p.add_run(headers[i]); run.bold = True
+        
+    if fast_table: fill_participant_rows(table, group, widths)
+    else:
+        for i, (idx, row) in enumerate(group.iterrows(), start=1):
+            row_cells = table.add_row().cells
+            vals = [str(i), row.get('NAMA','-'), row.get('NIP','-'), row.get('PANGKAT','-'), row.get('SATKER','-')]
+            for k in range(5): 
+                row_cells[k].width = widths[k]; row_cells[k].text = str(vals[k])
+                row_cells[k].vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+    
+    doc.add_paragraph("")
+
+def _add_ttd_block(doc, nama_ttd, jabatan_ttd):
+    ttd_table = doc.add_table(rows=1, cols=2); ttd_table.autofit = False
+    ttd_table.columns[0].width = Cm(8.0); ttd_table.columns[1].width = Cm(7.5)
+    
+    p = ttd_table.cell(0, 1).paragraphs[0]
+    p.alignment = WD_ALIGN_PARAGRAPH.LEFT
+    p.add_run(f"{jabatan_ttd},"); p.add_run("\n\n\n\n\n\n") 
+    run_elec = p.add_run("Ditandatangani secara elektronik")
+    run_elec.font.size = Pt(10); run_elec.font.color.rgb = RGBColor(160, 160, 160)
+    p.add_run(f"\n{nama_ttd}")
+
+def _group_lampiran(df):
+    col_judul = 'JUDUL_PELATIHAN' if 'JUDUL_PELATIHAN' in df.columns else df.columns[0]
+    return df.groupby(col_judul)
+
+@timed("docgen.word_combined")
+def generate_word_combined(df, nama_ttd, jabatan_ttd, no_nd_val, tgl_nd_val, fast_table=True, sharded=None, workers=None):
+    """Lampiran II gabungan semua pelatihan. sharded=None memilih otomatis: jika ada worker (ZIP_WORKERS > 1)
+    dan banyak pelatihan, tiap grup dirender paralel lalu body XML-nya disambung, lihat generate_word_sharded()."""
+    kelompok = _group_lampiran(df); workers = ZIP_WORKERS if workers is None else workers
+    if sharded is None: sharded = fast_table and workers > 1 and len(kelompok) >= LAMPIRAN_SHARD_MIN_GROUPS
+    if sharded and len(kelompok): return generate_word_sharded(df, nama_ttd, jabatan_ttd, no_nd_val, tgl_nd_val, workers=workers)
+
+    output = io.BytesIO(); doc = Document()
+    _add_lampiran_header(doc, jabatan_ttd, no_nd_val, tgl_nd_val)
+    total_groups = len(kelompok) 
+    counter = 0 
+    
+    for judul, group in kelompok:
+        counter += 1
+        _add_group_block(doc, judul, group, fast_table)
+        if counter == total_groups: _add_ttd_block(doc, nama_ttd, jabatan_ttd)
+        if counter < total_groups: 
+            doc.add_page_break()
+
+    doc.save(output); output.seek(0); return output
+
+# --- ZIP PARALEL (RENDER DI PROCESS POOL, SATU WRITER BERURUTAN) ---
+ZIP_WORKERS = int(os.environ.get("ZIP_WORKERS", "0"))   # 0/1 = serial; >1 = jumlah proses worker
+ZIP_CHUNK_SIZE = 100                                    # peserta per tugas worker
+ZIP_PARALLEL_MIN_ROWS = 200                             # di bawah ini serial lebih cepat dari overhead pool
+
+_pool = {'lock': threading.Lock(), 'executor': None, 'workers': 0}
+
+def _get_executor(workers):
+    # Pool dibuat sekali per proses dan dipakai ulang; 'spawn' agar aman dari thread server Streamlit
+    with _pool['lock']:
+        if _pool['executor'] is None or _pool['workers'] != workers:
+            if _pool['executor'] is not None: _pool['executor'].shutdown(wait=False)
+            _pool['executor'] = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _pool['workers'] = workers
+        return _pool['executor']
+
+def _reset_executor():
+    with _pool['lock']:
+        if _pool['executor'] is not None: _pool['executor'].shutdown(wait=False, cancel_futures=True)
+        _pool['executor'] = None; _pool['workers'] = 0
+
+def _zip_items(df):
+    items = []
+    for idx, row in df.iterrows():
+        judul = row.get('JUDUL_PELATIHAN', 'Diklat')
+        nama_file = f"{str(row.get('NAMA','Peserta')).replace(' ', '_')}_{str(row.get('NIP','000'))}.docx"
+        peserta = {k: row[k] for k in ('NAMA', 'NIP', 'PANGKAT', 'SATKER') if k in row}
+        items.append((nama_file, peserta, judul, row.get('TANGGAL_PELATIHAN','-'), row.get('TEMPAT','-')))
+    return items
+
+def _render_chunk(template, items):
+    return [(nama_file, render_single_document(template, peserta, judul, tgl, tempat)) for nama_file, peserta, judul, tgl, tempat in items]
+
+def _iter_pool(fn, tasks, workers):
+    """Hasil fn(*task) untuk setiap task sesuai urutan; paralel di process pool dengan jumlah tugas in-flight dibatasi."""
+    tasks = deque(tasks); executor = _get_executor(workers); pending = deque()
+    try:
+        while tasks or pending:
+            while tasks and len(pending) < workers * 2:
+                task = tasks.popleft(); pending.append((task, executor.submit(fn, *task)))
+            task, future = pending.popleft()
+            try: result = future.result()
+            except BrokenProcessPool:
+                # Worker mati (OOM/kill): tugas ini dan sisanya dijalankan serial agar hasil tetap lengkap
+                _reset_executor()
+                sisa = [task] + [t for t, _ in pending] + list(tasks); pending.clear(); tasks.clear()
+                for t in sisa: yield fn(*t)
+                return
+            yield result
+    finally:
+        for _, future in pending: future.cancel()
+
+def _iter_rendered(template, items, workers):
+    """(nama_file, bytes) sesuai urutan df; paralel per chunk peserta."""
+    if workers <= 1 or len(items) < ZIP_PARALLEL_MIN_ROWS:
+        for item in items: yield from _render_chunk(template, [item])
+        return
+    chunks = [(template, items[i:i + ZIP_CHUNK_SIZE]) for i in range(0, len(items), ZIP_CHUNK_SIZE)]
+    for result in _iter_pool(_render_chunk, chunks, workers): yield from result
+
+ZIP_PDF_BATCH = 200                                     # DOCX yang dikumpulkan sebelum dikirim ke pdf_converter
+
+@timed("docgen.zip")
+def generate_zip_files(df, nama_ttd, jabatan_ttd, no_nd_val, tgl_nd_val, workers=None, pdf_converter=None):
+    """Arsip ZIP (satu DOCX per peserta) ditulis per entry ke file temp di disk (tanpa salinan BytesIO/getvalue per
+    dokumen), dikembalikan terbuka di posisi 0; file terhapus saat ditutup. Selama dibangun yang ada di RAM hanya
+    entry yang sedang ditulis, tetapi pemanggil yang membaca arsip utuh (st.download_button) tetap butuh memori
+    sebesar arsip.
+    pdf_converter: callable [(nama.docx, bytes)] -> [(nama.pdf, bytes)] (mis. pdfconv.convert_many); jika diisi,
+    PDF tiap dokumen ikut ditulis ke folder PDF/ di arsip, dikonversi per ZIP_PDF_BATCH dokumen."""
+    workers = ZIP_WORKERS if workers is None else workers
+    zip_buffer = tempfile.TemporaryFile(suffix=".zip")
+    template = build_single_template(nama_ttd, jabatan_ttd, no_nd_val, tgl_nd_val)
+    antrian_pdf = []
+    def _tulis_pdf(zip_file):
+        for nama_pdf, pdf_bytes in pdf_converter(antrian_pdf): zip_file.writestr(f"PDF/{nama_pdf}", pdf_bytes)
+        antrian_pdf.clear()
+    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED, False) as zip_file:
+        for nama_file, doc_bytes in _iter_rendered(template, _zip_items(df), workers):
+            zip_file.writestr(nama_file, doc_bytes)
+            if pdf_converter is None: continue
+            antrian_pdf.append((nama_file, doc_bytes))
+            if len(antrian_pdf) >= ZIP_PDF_BATCH: _tulis_pdf(zip_file)
+        if antrian_pdf: _tulis_pdf(zip_file)
+    zip_buffer.seek(0); return zip_buffer
+
+# --- LAMPIRAN SHARDED (SATU DOCX PER PELATIHAN, BODY XML DISAMBUNG KE KERANGKA) ---
+LAMPIRAN_SHARD_MIN_GROUPS = 4          # generate_word_combined otomatis sharded (jika ada worker) mulai jumlah pelatihan ini
+_SHARD_MARKER = "@@LAMPIRAN_GRUP@@"
+SHARD_SCRATCH_ROWS = 5000            # Document() kerja dibuang & dibuat ulang setelah menampung sekian peserta
+_scratch = {'lock': threading.Lock(), 'doc': None, 'rows': 0}
+
+def _lampiran_skeleton(nama_ttd, jabatan_ttd, no_nd_val, tgl_nd_val):
+    # Kerangka: header LAMPIRAN II + footer PAGE + penanda grup + satu blok TTD; dipecah di penanda
+    doc = Document(); _add_lampiran_header(doc, jabatan_ttd, no_nd_val, tgl_nd_val)
+    doc.add_paragraph(_SHARD_MARKER); _add_ttd_block(doc, nama_ttd, jabatan_ttd)
+    buf = io.BytesIO(); doc.save(buf)
+    with zipfile.ZipFile(buf) as zf: parts = [(info.filename, zf.read(info.filename)) for info in zf.infolist()]
+    pieces = dict(parts)['word/document.xml'].decode('utf-8').split(f"<w:p>{_run_xml(_SHARD_MARKER)}</w:p>")
+    if len(pieces) != 2: raise ValueError("Kerangka Lampiran tidak valid: penanda grup tidak ditemukan.")
+    return {'parts': parts, 'head': pieces[0], 'tail': pieces[1]}
+
+def _render_group_xml(judul, group, page_break):
+    """Body XML satu pelatihan (blok daftar peserta + page break bila bukan grup terakhir), tanpa sectPr."""
+    with _scratch['lock']:
+        # Document() kerja dipakai ulang antar grup: membuat Document() baru (~15 ms) atau melepas elemen
+        # dari body jauh lebih mahal daripada menumpuk blok lalu membuang dokumennya sesekali
+        if _scratch['doc'] is None or _scratch['rows'] > SHARD_SCRATCH_ROWS:
+            _scratch['doc'] = Document(); _scratch['rows'] = 0
+            _setup_lampiran_page(_scratch['doc'])   # lebar blok tabel mengikuti margin yang sama
+        doc = _scratch['doc']; body = doc.element.body; mulai = len(body) - 1
+        _add_group_block(doc, judul, group)
+        if page_break: doc.add_page_break()
+        _scratch['rows'] += len(group)
+        out = []
+        for el in body[mulai:-1]:
+            xml = etree.tostring(el, encoding='unicode'); end = xml.index('>')
+            out.append(re.sub(r' xmlns:\w+="[^"]*"', '', xml[:end]) + xml[end:])   # namespace sudah dideklarasikan di w:document
+        return ''.join(out)
+
+@timed("docgen.word_sharded")
+def generate_word_sharded(df, nama_ttd, jabatan_ttd, no_nd_val, tgl_nd_val, workers=None):
+    """Lampiran gabungan yang dirender per pelatihan (paralel di process pool jika workers > 1), lalu body XML
+    tiap grup ditulis berurutan ke document.xml kerangka. Isi sama dengan generate_word_combined(sharded=False):
+    satu header LAMPIRAN II, page break antar pelatihan, nomor halaman di footer dan satu TTD di akhir."""
+    workers = ZIP_WORKERS if workers is None else workers
+    kelompok = _group_lampiran(df); col_judul = kelompok.keys
+    cols = [c for c in [col_judul] + PESERTA_COLS + ['TANGGAL_PELATIHAN', 'TEMPAT'] if c in df.columns]
+    tasks = [(judul, group[cols], i < len(kelompok) - 1) for i, (judul, group) in enumerate(kelompok)]
+    if workers <= 1 or len(tasks) < 2 or len(df) < ZIP_PARALLEL_MIN_ROWS: fragments = (_render_group_xml(*t) for t in tasks)
+    else: fragments = _iter_pool(_render_group_xml, tasks, workers)
+
+    skeleton = _lampiran_skeleton(nama_ttd, jabatan_ttd, no_nd_val, tgl_nd_val)
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, blob in skeleton['parts']:
+            if name != 'word/document.xml': zf.writestr(name, blob); continue
+            with zf.open(name, "w") as f:
+                f.write(skeleton['head'].encode('utf-8'))
+                for xml in fragments: f.write(xml.encode('utf-8'))
+                f.write(skeleton['tail'].encode('utf-8'))
+    output.seek(0); return output
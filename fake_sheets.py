@@ -0,0 +1,133 @@
+import re
+import threading
+from collections import Counter
+
+import gspread
+
+from kalender import KOLOM_KALENDER
+
+# =============================================================================
+# PENGGANTI GOOGLE SHEETS DI MEMORI (GSHEET_FAKE=1, UNTUK JALAN LOKAL & TEST)
+# =============================================================================
+# Hanya subset API gspread yang dipakai aplikasi; setiap panggilan dihitung di .calls
+HEADER_HISTORY = ['TIMESTAMP', 'NAMA', 'NIP', 'DIKLAT', 'SATKER']
+
+def _a1_to_rowcol(cell):
+    m = re.fullmatch(r"([A-Z]+)(\d*)", cell.upper())
+    if not m: raise ValueError(f"Range tidak dikenal: {cell}")
+    col = 0
+    for ch in m.group(1): col = col * 26 + ord(ch) - 64
+    return (int(m.group(2)) if m.group(2) else None), col
+
+def _numericise(value):
+    # Sama dengan get_all_records() gspread: angka jadi int/float, sisanya tetap string
+    if value == "": return value
+    try: return int(value)
+    except ValueError: pass
+    try: return float(value)
+    except ValueError: return value
+
+class FakeWorksheet:
+    def __init__(self, title, rows=None):
+        self.title = title; self.calls = Counter(); self._lock = threading.Lock()
+        self._rows = [[str(v) for v in r] for r in (rows or [])]
+
+    def _trimmed(self):
+        rows = list(self._rows)
+        while rows and not any(rows[-1]): rows.pop()
+        return rows
+
+    def _write(self, start_cell, values):
+        row0, col0 = _a1_to_rowcol(start_cell)
+        for i, vals in enumerate(values):
+            r = row0 - 1 + i
+            while len(self._rows) <= r: self._rows.append([])
+            row = self._rows[r]
+            while len(row) < col0 - 1 + len(vals): row.append("")
+            for j, v in enumerate(vals): row[col0 - 1 + j] = "" if v is None else str(v)
+
+    # --- BACA ---
+    def get_all_values(self):
+        with self._lock:
+            self.calls['get_all_values'] += 1
+            rows = self._trimmed(); width = max((len(r) for r in rows), default=0)
+            return [r + [""] * (width - len(r)) for r in rows]
+
+    def get_all_records(self):
+        with self._lock:
+            self.calls['get_all_records'] += 1
+            rows = self._trimmed()
+            if not rows: return []
+            header = rows[0]
+            return [{h: _numericise(r[i]) if i < len(r) else "" for i, h in enumerate(header)} for r in rows[1:]]
+
+    def get(self, range_name):
+        with self._lock:
+            self.calls['get'] += 1
+            awal, akhir = (range_name.split(":") + [None])[:2]
+            row0, col0 = _a1_to_rowcol(awal); col1 = _a1_to_rowcol(akhir)[1] if akhir else col0
+            out = [[v for v in r[col0 - 1:col1]] for r in self._trimmed()[(row0 or 1) - 1:]]
+            for r in out:
+                while r and r[-1] == "": r.pop()
+            while out and not out[-1]: out.pop()
+            return out
+
+    # --- TULIS ---
+    def update(self, range_name=None, values=None, **kwargs):
+        with self._lock:
+            self.calls['update'] += 1
+            self._write(range_name.split(":")[0], values or [])
+
+    def batch_update(self, data, raw=True, **kwargs):
+        with self._lock:
+            self.calls['batch_update'] += 1
+            for item in data: self._write(item['range'].split(":")[0], item['values'])
+
+    def append_rows(self, values, **kwargs):
+        with self._lock:
+            self.calls['append_rows'] += 1
+            self._rows = self._trimmed() + [["" if v is None else str(v) for v in r] for r in values]
+
+    def append_row(self, values, **kwargs):
+        with self._lock:
+            self.calls['append_row'] += 1
+            self._rows = self._trimmed() + [["" if v is None else str(v) for v in values]]
+
+    def clear(self):
+        with self._lock:
+            self.calls['clear'] += 1
+            self._rows = []
+
+class FakeSpreadsheet:
+    def __init__(self, sheets=None):
+        self._lock = threading.Lock(); self.calls = Counter()
+        self._sheets = {name: FakeWorksheet(name, rows) for name, rows in (sheets or {}).items()}
+
+    def worksheet(self, title):
+        with self._lock:
+            self.calls['worksheet'] += 1
+            if title not in self._sheets: raise gspread.exceptions.WorksheetNotFound(title)
+            return self._sheets[title]
+
+    def add_worksheet(self, title, rows=0, cols=0, **kwargs):
+        with self._lock:
+            self.calls['add_worksheet'] += 1
+            self._sheets[title] = FakeWorksheet(title)
+            return self._sheets[title]
+
+    def api_calls(self):
+        """Total panggilan per metode (spreadsheet + semua worksheet)."""
+        total = Counter(self.calls)
+        for ws in self._sheets.values(): total.update(ws.calls)
+        return total
+
+def new_fake_spreadsheet():
+    return FakeSpreadsheet({'Sheet1': [HEADER_HISTORY], 'Master_Kalender': [KOLOM_KALENDER]})
+
+_instance = {'lock': threading.Lock(), 'spreadsheet': None}
+
+def fake_spreadsheet():
+    """Satu spreadsheet palsu per proses (isi hilang saat proses berhenti)."""
+    with _instance['lock']:
+        if _instance['spreadsheet'] is None: _instance['spreadsheet'] = new_fake_spreadsheet()
+        return _instance['spreadsheet']
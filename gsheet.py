@@ -0,0 +1,242 @@
+import datetime
+import os
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+from kalender import KOLOM_KALENDER, build_title_index, plan_calendar_upsert, resolve_titles, row_ranges
+from perf import count_api, span, timed
+
+# --- LIBRARY GOOGLE SHEETS ---
+import gspread
+from oauth2client.service_account import ServiceAccountCredentials
+from google.auth.exceptions import RefreshError, TransportError
+from google.auth.transport.requests import Request
+
+# =============================================================================
+# KONFIGURASI KONEKSI
+# =============================================================================
+NAMA_GOOGLE_SHEET = "Database_Diklat_DJBC"
+SHEET_HISTORY = "Sheet1"
+SHEET_KALENDER = "Master_Kalender"
+
+SCOPE = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
+TOKEN_REFRESH_MARGIN = 300   # detik sebelum token kedaluwarsa -> refresh lebih awal
+CONNECT_COOLDOWN = 15        # detik jeda sebelum mencoba koneksi ulang setelah gagal
+AUTH_ERROR_CODES = (401, 403)
+SHEET_CACHE_TTL = float(os.environ.get("SHEET_CACHE_TTL", "60"))  # detik; maksimal 1x baca per worksheet per TTL
+USE_FAKE_SHEETS = os.environ.get("GSHEET_FAKE") == "1"            # pengganti Sheets di memori (lokal/test), lihat fake_sheets.py
+
+# =============================================================================
+# POOL KONEKSI (SATU PER PROSES, DIPAKAI SEMUA SESI & RERUN)
+# =============================================================================
+@st.cache_resource(show_spinner=False)
+def _get_pool():
+    return {'lock': threading.RLock(), 'client': None, 'spreadsheet': None, 'worksheets': {}, 'last_failure': 0.0}
+
+def _open_spreadsheet(pool):
+    if USE_FAKE_SHEETS:
+        from fake_sheets import fake_spreadsheet
+        pool['spreadsheet'] = fake_spreadsheet(); pool['client'] = None; pool['worksheets'] = {}
+        return
+    creds_dict = dict(st.secrets["gcp_service_account"])
+    creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, SCOPE)
+    client = gspread.authorize(creds)
+    pool['spreadsheet'] = client.open(NAMA_GOOGLE_SHEET); count_api("sheets.open")
+    pool['client'] = client; pool['worksheets'] = {}
+
+def _token_expiring(client):
+    creds = getattr(client.http_client, 'auth', None)
+    if creds is None: return False
+    expiry = getattr(creds, 'expiry', None)
+    if not getattr(creds, 'token', None) or expiry is None: return True
+    # google-auth menyimpan expiry sebagai datetime UTC naif
+    if expiry.tzinfo is None: expiry = expiry.replace(tzinfo=datetime.timezone.utc)
+    sisa = (expiry - datetime.datetime.now(datetime.timezone.utc)).total_seconds()
+    return sisa < TOKEN_REFRESH_MARGIN
+
+def _refresh_token(pool):
+    client = pool['client']
+    if client is None or not _token_expiring(client): return
+    try: client.http_client.auth.refresh(Request())
+    except (RefreshError, TransportError): reset_connection()
+
+def reset_connection():
+    pool = _get_pool()
+    with pool['lock']:
+        pool['client'] = None; pool['spreadsheet'] = None; pool['worksheets'] = {}
+
+@timed("sheets.connect")
+def connect_to_gsheet():
+    """Spreadsheet yang sudah ter-otorisasi; koneksi dibuat sekali per proses lalu dipakai ulang."""
+    pool = _get_pool()
+    with pool['lock']:
+        _refresh_token(pool)
+        if pool['spreadsheet'] is not None: return pool['spreadsheet']
+        if time.time() - pool['last_failure'] < CONNECT_COOLDOWN: return None
+        try:
+            _open_spreadsheet(pool)
+            return pool['spreadsheet']
+        except:
+            pool['last_failure'] = time.time()
+            return None
+
+def get_worksheet(nama_sheet):
+    """Handle worksheet berdasarkan nama (di-cache per proses). Raise WorksheetNotFound jika sheet tidak ada."""
+    sh = connect_to_gsheet()
+    if sh is None: return None
+    pool = _get_pool()
+    with pool['lock']:
+        ws = pool['worksheets'].get(nama_sheet)
+        if ws is None:
+            ws = sh.worksheet(nama_sheet); count_api("sheets.worksheet")
+            pool['worksheets'][nama_sheet] = ws
+        return ws
+
+def _is_auth_error(e):
+    if isinstance(e, RefreshError): return True
+    return isinstance(e, gspread.exceptions.APIError) and e.code in AUTH_ERROR_CODES
+
+def with_worksheet(nama_sheet, fn, op="call", calls=1):
+    """Jalankan fn(ws); jika gagal karena otorisasi, koneksi dibangun ulang lalu dicoba sekali lagi.
+    op/calls = label span & jumlah panggilan API yang dilakukan fn (untuk panel Performance)."""
+    with span(f"sheets.{op}", sheet=nama_sheet):
+        ws = get_worksheet(nama_sheet)
+        if ws is None: raise ConnectionError("Gagal koneksi ke Google Sheets.")
+        count_api(f"sheets.{op}", calls)
+        try: return fn(ws)
+        except Exception as e:
+            if not _is_auth_error(e): raise
+            reset_connection()
+            ws = get_worksheet(nama_sheet)
+            if ws is None: raise
+            count_api(f"sheets.{op}", calls)
+            return fn(ws)
+
+# =============================================================================
+# CACHE DATAFRAME PER WORKSHEET (READ-THROUGH + TTL + VERSI)
+# =============================================================================
+@st.cache_resource(show_spinner=False)
+def _get_sheet_cache():
+    return {'lock': threading.Lock(), 'entries': {}}
+
+def _cache_entry(nama_sheet):
+    cache = _get_sheet_cache()
+    with cache['lock']:
+        if nama_sheet not in cache['entries']:
+            cache['entries'][nama_sheet] = {'lock': threading.Lock(), 'df': None, 'fetched_at': 0.0, 'version': 0}
+        return cache['entries'][nama_sheet]
+
+def read_sheet_df(nama_sheet, ttl=None):
+    """Isi worksheet (get_all_records) sebagai DataFrame bersama. Hanya dibaca ulang dari Sheets
+    jika umur cache melewati ttl (default SHEET_CACHE_TTL); ttl=0 memaksa baca ulang.
+    DataFrame yang dikembalikan dipakai bersama semua sesi, jangan diubah in-place."""
+    ttl = SHEET_CACHE_TTL if ttl is None else ttl
+    entry = _cache_entry(nama_sheet)
+    with entry['lock']:
+        if entry['df'] is not None and time.time() - entry['fetched_at'] < ttl: return entry['df']
+        df = pd.DataFrame(with_worksheet(nama_sheet, lambda ws: ws.get_all_records(), op="get_all_records"))
+        entry['df'] = df; entry['fetched_at'] = time.time(); entry['version'] += 1
+        return df
+
+def sheet_version(nama_sheet):
+    """Nomor versi cache; naik setiap kali isi cache berubah (baca ulang, patch, atau invalidasi)."""
+    return _cache_entry(nama_sheet)['version']
+
+def invalidate_sheet(nama_sheet):
+    entry = _cache_entry(nama_sheet)
+    with entry['lock']:
+        entry['df'] = None; entry['fetched_at'] = 0.0; entry['version'] += 1
+
+def patch_sheet_df(nama_sheet, fn):
+    """Terapkan fn(df_copy) -> df ke salinan cache setelah menulis ke Sheets, tanpa membaca ulang."""
+    entry = _cache_entry(nama_sheet)
+    with entry['lock']:
+        if entry['df'] is None: return
+        entry['df'] = fn(entry['df'].copy()); entry['version'] += 1
+
+# =============================================================================
+# OPERASI TULIS (DIPANGGIL LANGSUNG ATAU LEWAT ANTRIAN write_queue.py)
+# =============================================================================
+def append_history_rows(rows):
+    with_worksheet(SHEET_HISTORY, lambda ws: ws.append_rows(rows), op="append_rows")
+    invalidate_sheet(SHEET_HISTORY)
+
+def clear_history_sheet():
+    def _clear(ws): ws.clear(); ws.append_row(['TIMESTAMP', 'NAMA', 'NIP', 'DIKLAT', 'SATKER'])
+    with_worksheet(SHEET_HISTORY, _clear, op="clear", calls=2)
+    invalidate_sheet(SHEET_HISTORY)
+
+def upsert_calendar_rows(rows):
+    """Upsert [(judul, rencana, lokasi)] ke Master_Kalender: baris berubah di-update per blok range, judul baru
+    di-append. Aman diulang (antrian tulis): judul yang sudah sama dihitung 'unchanged'. Return ringkasan."""
+    df_old = read_sheet_df(SHEET_KALENDER, ttl=0)
+    plan = plan_calendar_upsert(df_old, rows)
+    changed = {pos + 2: vals for pos, vals in plan['changed'].items()}   # +2: header + index 1-based
+    if changed:
+        updates = [{'range': f"C{a}:D{b}", 'values': [changed[r] for r in range(a, b + 1)]} for a, b in row_ranges(changed)]
+        with_worksheet(SHEET_KALENDER, lambda ws: ws.batch_update(updates), op="batch_update")
+    if plan['inserted']:
+        def _append(ws):
+            if df_old.empty: ws.update(range_name="A1:F1", values=[KOLOM_KALENDER])
+            ws.append_rows(plan['inserted'])
+        with_worksheet(SHEET_KALENDER, _append, op="append_rows", calls=1 + df_old.empty)
+    if changed or plan['inserted']: invalidate_sheet(SHEET_KALENDER)
+    return plan['summary']
+
+def reset_calendar_status():
+    """Semua STATUS -> 'Pending', REALISASI -> '-' dalam satu update. Return jumlah baris yang di-reset."""
+    all_values = with_worksheet(SHEET_KALENDER, lambda ws: ws.get_all_values(), op="get_all_values")
+    if len(all_values) <= 1: return 0
+    new_data = []
+    for row in all_values[1:]:
+        while len(row) < 6: row.append("")
+        row[4] = "Pending"
+        row[5] = "-"
+        new_data.append(row)
+    with_worksheet(SHEET_KALENDER, lambda ws: ws.update(range_name=f"A2:F{len(all_values)}", values=new_data), op="update")
+    def _patch(df_cache):
+        if not df_cache.empty: df_cache['STATUS'] = "Pending"; df_cache['REALISASI'] = "-"
+        return df_cache
+    patch_sheet_df(SHEET_KALENDER, _patch)
+    return len(new_data)
+
+def _mark_rows_complete(rows):
+    # 1x batch_update untuk semua baris (posisi 0-based data) + patch cache tanpa membaca ulang
+    rows = sorted(set(rows))
+    if not rows: return
+    current_time = datetime.datetime.now().strftime("%d-%m-%Y")
+    updates = [{'range': f"E{r + 2}:F{r + 2}", 'values': [["Selesai", current_time]]} for r in rows]
+    with_worksheet(SHEET_KALENDER, lambda ws: ws.batch_update(updates, raw=False), op="batch_update")
+    def _patch(df_cache):
+        df_cache.loc[df_cache.index[rows], ['STATUS', 'REALISASI']] = ["Selesai", current_time]; return df_cache
+    patch_sheet_df(SHEET_KALENDER, _patch)
+
+def mark_ids_complete(ids):
+    """Tandai jadwal dengan ID kalender tertentu 'Selesai' (ID hasil resolve_titles saat upload).
+    Return {'matched': [...], 'unmatched': [...]}; raise jika koneksi/penulisan gagal supaya antrian mencoba ulang."""
+    ids = list(dict.fromkeys(str(i) for i in ids))
+    if not ids: return {'matched': [], 'unmatched': []}
+    df = read_sheet_df(SHEET_KALENDER, ttl=0)
+    if df.empty or 'ID' not in df.columns: return {'matched': [], 'unmatched': ids}
+    index_id = {}
+    for pos, i in enumerate(df['ID'].astype(str).tolist()): index_id.setdefault(i, pos)
+    _mark_rows_complete([index_id[i] for i in ids if i in index_id])
+    return {'matched': [i for i in ids if i in index_id], 'unmatched': [i for i in ids if i not in index_id]}
+
+def mark_trainings_complete(judul_list):
+    """Tandai banyak judul 'Selesai' sekaligus: 1x baca kalender + 1x batch_update untuk semua baris.
+    Judul dicocokkan lewat indeks judul, hanya persis atau normalisasi; hasil kemiripan trigram tidak pernah
+    diterapkan di sini karena tidak ada user yang mengonfirmasi (lihat kalender.resolve_titles).
+    Return {'matched': [...], 'unmatched': [...]} (urutan sesuai judul_list, tanpa duplikat).
+    Raise jika koneksi/penulisan gagal supaya pemanggil (antrian tulis) bisa mencoba ulang."""
+    judul_list = list(dict.fromkeys(judul_list))
+    if not judul_list: return {'matched': [], 'unmatched': []}
+    df = read_sheet_df(SHEET_KALENDER, ttl=0)
+    if df.empty or 'JUDUL_PELATIHAN' not in df.columns: return {'matched': [], 'unmatched': judul_list}
+    hasil = resolve_titles(judul_list, build_title_index(df))
+    matched = [j for j in judul_list if hasil[str(j)]['pos'] is not None]
+    _mark_rows_complete([hasil[str(j)]['pos'] for j in matched])
+    return {'matched': matched, 'unmatched': [j for j in judul_list if j not in matched]}
@@ -0,0 +1,211 @@
+import datetime
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+from gsheet import SHEET_CACHE_TTL, SHEET_HISTORY, with_worksheet
+from perf import timed
+
+# =============================================================================
+# MIRROR LOKAL LOG PESERTA (Sheet1 -> SQLITE, SINKRON INKREMENTAL)
+# =============================================================================
+DATA_DIR = os.environ.get("DIKLAT_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data"))
+HISTORY_DB = os.path.join(DATA_DIR, "history.sqlite")
+HISTORY_COLS = ['TIMESTAMP', 'NAMA', 'NIP', 'DIKLAT', 'SATKER']
+FILTER_COLS = ('DIKLAT', 'SATKER')
+SQL_CHUNK = 900   # batas aman jumlah parameter per query IN (...)
+
+# NIP_KEY = NIP tanpa spasi/titik/strip, dipakai untuk indeks riwayat peserta
+def _nip_key_sql(expr): return f"REPLACE(REPLACE(REPLACE({expr}, ' ', ''), '.', ''), '-', '')"
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (row_no INTEGER PRIMARY KEY, TIMESTAMP TEXT, NAMA TEXT, NIP TEXT, DIKLAT TEXT, SATKER TEXT);
+CREATE TABLE IF NOT EXISTS pending (TIMESTAMP TEXT, NAMA TEXT, NIP TEXT, DIKLAT TEXT, SATKER TEXT, NIP_KEY TEXT);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_history_diklat ON history (DIKLAT);
+CREATE INDEX IF NOT EXISTS idx_history_satker ON history (SATKER);
+CREATE INDEX IF NOT EXISTS idx_history_nip ON history (NIP);
+CREATE INDEX IF NOT EXISTS idx_history_ts ON history (TIMESTAMP);
+CREATE INDEX IF NOT EXISTS idx_history_nip_key ON history (NIP_KEY, DIKLAT, TIMESTAMP);
+CREATE INDEX IF NOT EXISTS idx_pending_nip_key ON pending (NIP_KEY);
+"""
+
+def _connect():
+    os.makedirs(DATA_DIR, exist_ok=True)
+    con = sqlite3.connect(HISTORY_DB, timeout=30)
+    con.executescript(_SCHEMA)
+    # Migrasi mirror lama (sebelum ada kolom NIP_KEY)
+    if 'NIP_KEY' not in [r[1] for r in con.execute("PRAGMA table_info(history)")]:
+        con.execute("ALTER TABLE history ADD COLUMN NIP_KEY TEXT")
+        con.execute(f"UPDATE history SET NIP_KEY = {_nip_key_sql('NIP')}"); con.commit()
+    con.executescript(_INDEXES)
+    return con
+
+@st.cache_resource(show_spinner=False)
+def _get_state():
+    return {'lock': threading.Lock(), 'last_sync': 0.0}
+
+def _get_meta(con, key, default=None):
+    row = con.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else default
+
+def _set_meta(con, **values):
+    con.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", [(k, str(v)) for k, v in values.items()])
+
+def _pad(row): return [str(v) for v in (list(row) + [""] * len(HISTORY_COLS))[:len(HISTORY_COLS)]]
+
+# --- SINKRONISASI ---
+@timed("history.sync")
+def sync_history(force=False):
+    """Tarik hanya baris Sheet1 setelah baris terakhir yang sudah tersimpan (maksimal sekali per TTL).
+    Baris jangkar (baris terakhir yang sudah disinkron) ikut diambil; jika isinya berbeda, log di Sheets
+    dianggap sudah dihapus/diubah dan mirror dibangun ulang dari awal. Return jumlah baris baru."""
+    state = _get_state()
+    with state['lock']:
+        if not force and time.time() - state['last_sync'] < SHEET_CACHE_TTL: return 0
+        con = _connect()
+        try:
+            synced = int(_get_meta(con, 'synced_rows', 0))
+            anchor = con.execute(f"SELECT {', '.join(HISTORY_COLS)} FROM history WHERE row_no = ?", (synced,)).fetchone() if synced else None
+            values = with_worksheet(SHEET_HISTORY, lambda ws: ws.get(f"A{synced + 1}:E"), op="get")
+            if synced and (not values or _pad(values[0]) != list(anchor or [])):
+                con.execute("DELETE FROM history"); synced = 0
+                values = with_worksheet(SHEET_HISTORY, lambda ws: ws.get("A1:E"), op="get")
+            new_rows = [_pad(r) for r in values[1:]]   # baris kosong tetap disimpan agar nomor baris sama dengan Sheets
+            con.executemany(f"INSERT OR REPLACE INTO history (row_no, {', '.join(HISTORY_COLS)}, NIP_KEY) VALUES (?, ?, ?, ?, ?, ?, {_nip_key_sql('?')})",
+                            [[synced + i] + r + [r[2]] for i, r in enumerate(new_rows, start=1)])
+            # Baris lokal yang sudah muncul di Sheets tidak perlu disimpan sebagai pending lagi
+            con.execute("DELETE FROM pending WHERE EXISTS (SELECT 1 FROM history h WHERE h.NIP_KEY = pending.NIP_KEY "
+                        "AND h.DIKLAT = pending.DIKLAT AND h.TIMESTAMP = pending.TIMESTAMP)")
+            _set_meta(con, synced_rows=synced + len(new_rows), last_sync=datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            con.commit()
+            state['last_sync'] = time.time()
+            return len(new_rows)
+        finally: con.close()
+
+def reset_history_mirror():
+    state = _get_state()
+    with state['lock']:
+        con = _connect()
+        try:
+            con.execute("DELETE FROM history"); _set_meta(con, synced_rows=0); con.commit()
+        finally: con.close()
+        state['last_sync'] = 0.0
+
+# --- QUERY (FILTER + PAGINASI DI SQLITE) ---
+def _where(diklat=None, satker=None, nip=None, date_from=None, date_to=None):
+    clauses, params = ["(TIMESTAMP != '' OR NAMA != '')"], []
+    if diklat: clauses.append("DIKLAT = ?"); params.append(diklat)
+    if satker: clauses.append("SATKER = ?"); params.append(satker)
+    if nip:
+        # Awalan NIP diperlakukan literal: '%' dan '_' yang diketik user bukan wildcard
+        awalan = nip.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        clauses.append("NIP LIKE ? ESCAPE '\\'"); params.append(f"{awalan}%")
+    if date_from: clauses.append("TIMESTAMP >= ?"); params.append(date_from.strftime("%Y-%m-%d"))
+    if date_to: clauses.append("TIMESTAMP < ?"); params.append((date_to + datetime.timedelta(days=1)).strftime("%Y-%m-%d"))
+    return " WHERE " + " AND ".join(clauses), params
+
+def count_history(**filters):
+    where, params = _where(**filters)
+    con = _connect()
+    try: return con.execute(f"SELECT COUNT(*) FROM history{where}", params).fetchone()[0]
+    finally: con.close()
+
+def query_history(page=1, page_size=50, **filters):
+    """DataFrame satu halaman log sesuai filter, terbaru di atas."""
+    where, params = _where(**filters)
+    con = _connect()
+    try:
+        offset = max(0, (page - 1) * page_size)
+        return pd.read_sql_query(f"SELECT {', '.join(HISTORY_COLS)} FROM history{where} ORDER BY row_no DESC LIMIT ? OFFSET ?",
+                                 con, params=params + [page_size, offset])
+    finally: con.close()
+
+def distinct_values(col):
+    if col not in FILTER_COLS: raise ValueError(f"Kolom filter tidak dikenal: {col}")
+    con = _connect()
+    try: return [r[0] for r in con.execute(f"SELECT DISTINCT {col} FROM history WHERE {col} != '' ORDER BY {col}")]
+    finally: con.close()
+
+def mirror_status():
+    con = _connect()
+    try: return {'synced_rows': int(_get_meta(con, 'synced_rows', 0)), 'last_sync': _get_meta(con, 'last_sync')}
+    finally: con.close()
+
+# --- MODE LOKAL (STORAGE_MODE=local): TABEL history ADALAH PENYIMPANAN UTAMA ---
+def append_local_history(rows):
+    """Tambah baris log langsung ke tabel history (tanpa Sheets); nomor baris melanjutkan yang terakhir."""
+    if not rows: return
+    state = _get_state()
+    with state['lock']:
+        con = _connect()
+        try:
+            last = con.execute("SELECT COALESCE(MAX(row_no), 0) FROM history").fetchone()[0]
+            con.executemany(f"INSERT INTO history (row_no, {', '.join(HISTORY_COLS)}, NIP_KEY) VALUES (?, ?, ?, ?, ?, ?, {_nip_key_sql('?')})",
+                            [[last + i] + _pad(r) + [_pad(r)[2]] for i, r in enumerate(rows, start=1)])
+            _set_meta(con, synced_rows=last + len(rows)); con.commit()
+        finally: con.close()
+
+def clear_local_history():
+    """Kosongkan log lokal: mirror dan baris pending."""
+    reset_history_mirror()
+    con = _connect()
+    try: con.execute("DELETE FROM pending"); con.commit()
+    finally: con.close()
+
+# =============================================================================
+# INDEKS RIWAYAT PESERTA (NIP -> DIKLAT, TIMESTAMP)
+# =============================================================================
+def record_local_history(df_log):
+    """Catat baris log yang baru diantrikan (belum tentu sudah sampai di Sheets) supaya langsung
+    terlihat oleh annotate_prior_attendance; dihapus otomatis saat barisnya tersinkron."""
+    rows = [[str(df_log[c].iloc[i]) if c in df_log.columns else "" for c in HISTORY_COLS] for i in range(len(df_log))]
+    if not rows: return
+    con = _connect()
+    try:
+        con.executemany(f"INSERT INTO pending ({', '.join(HISTORY_COLS)}, NIP_KEY) VALUES (?, ?, ?, ?, ?, {_nip_key_sql('?')})",
+                        [r + [r[2]] for r in rows])
+        con.commit()
+    finally: con.close()
+
+def lookup_attendance(nip_keys):
+    """Riwayat per (NIP_KEY, DIKLAT): jumlah dan TIMESTAMP terakhir. Memakai indeks NIP_KEY, jadi waktunya
+    bergantung pada jumlah NIP yang dicari, bukan panjang log."""
+    keys = sorted({k for k in nip_keys if k})
+    frames = []
+    con = _connect()
+    try:
+        for i in range(0, len(keys), SQL_CHUNK):
+            chunk = keys[i:i + SQL_CHUNK]; marks = ", ".join("?" * len(chunk))
+            frames.append(pd.read_sql_query(
+                f"SELECT NIP_KEY, DIKLAT, COUNT(*) AS JUMLAH, MAX(TIMESTAMP) AS TERAKHIR FROM ("
+                f" SELECT NIP_KEY, DIKLAT, TIMESTAMP FROM history WHERE NIP_KEY IN ({marks})"
+                f" UNION ALL SELECT NIP_KEY, DIKLAT, TIMESTAMP FROM pending WHERE NIP_KEY IN ({marks})"
+                f") GROUP BY NIP_KEY, DIKLAT", con, params=chunk + chunk))
+    finally: con.close()
+    if not frames: return pd.DataFrame(columns=['NIP_KEY', 'DIKLAT', 'JUMLAH', 'TERAKHIR'])
+    return pd.concat(frames, ignore_index=True)
+
+def annotate_prior_attendance(df, nip_col='NIP', judul_col='JUDUL_PELATIHAN'):
+    """Tambah kolom PERNAH_IKUT (pernah ikut diklat yang sama), TERAKHIR_IKUT dan JML_RIWAYAT
+    (total riwayat semua diklat) ke df dalam satu join terhadap indeks riwayat."""
+    keys = df[nip_col].astype(str).str.replace(r"[ .\-]", "", regex=True)
+    riwayat = lookup_attendance(keys.tolist())
+    total = riwayat.groupby('NIP_KEY')['JUMLAH'].sum()
+
+    judul_norm = df[judul_col].astype(str).str.strip().str.casefold() if judul_col in df.columns else pd.Series("", index=df.index)
+    riwayat = riwayat.assign(JUDUL_NORM=riwayat['DIKLAT'].astype(str).str.strip().str.casefold())
+    sama = riwayat.groupby(['NIP_KEY', 'JUDUL_NORM'])['TERAKHIR'].max().rename('TERAKHIR_IKUT').reset_index()
+    kunci = pd.DataFrame({'NIP_KEY': keys.to_numpy(), 'JUDUL_NORM': judul_norm.to_numpy()})
+    gabung = kunci.merge(sama, on=['NIP_KEY', 'JUDUL_NORM'], how='left')
+
+    df = df.copy()
+    df['PERNAH_IKUT'] = gabung['TERAKHIR_IKUT'].notna().to_numpy()
+    df['TERAKHIR_IKUT'] = gabung['TERAKHIR_IKUT'].fillna("-").to_numpy()
+    df['JML_RIWAYAT'] = keys.map(total).fillna(0).astype(int).to_numpy()
+    return df
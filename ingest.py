@@ -0,0 +1,131 @@
+import csv
+import hashlib
+import io
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from openpyxl import load_workbook
+
+from perf import timed
+
+# =============================================================================
+# INGESTI FILE UPLOAD (HEADER DULU, LALU HANYA KOLOM TERPETAKAN)
+# =============================================================================
+# Aturan deteksi kolom peserta, dicek berurutan (aturan pertama yang cocok dipakai)
+ROSTER_RULES = [
+    ("NAMA", ("NAMA",)),
+    ("NIP", ("NIP",)),
+    ("PANGKAT", ("PANGKAT", "GOL")),
+    ("SATKER", ("KERJA", "SATKER")),
+    ("TEMPAT", ("TEMPAT",)),
+    ("JUDUL_PELATIHAN", ("JUDUL", "DIKLAT")),
+    ("TANGGAL_PELATIHAN", ("TANGGAL",)),
+]
+CALENDAR_COLS = ['JUDUL_PELATIHAN', 'TANGGAL_MULAI', 'TANGGAL_SELESAI', 'LOKASI']
+CSV_DELIMITERS = ",;\t|"
+CSV_ENCODINGS = ("utf-8-sig", "cp1252")   # CSV hasil "Save As" Excel Windows biasanya cp1252
+INGEST_CACHE_ENTRIES = 8
+
+def file_digest(data): return hashlib.sha1(data).hexdigest()
+
+def frame_digest(df):
+    """SHA-1 seluruh isi DataFrame (semua baris + index, lalu nama kolom) sebagai kunci cache eksplisit.
+    Hasher bawaan st.cache_data hanya mengambil sampel 10.000 baris untuk DataFrame >= 50.000 baris."""
+    h = hashlib.sha1(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    h.update(repr(list(df.columns)).encode("utf-8"))
+    return h.hexdigest()
+
+def _is_csv(file_name): return str(file_name).lower().endswith(".csv")
+
+def map_roster_column(header):
+    """Nama kanonik untuk satu header kolom peserta, atau None jika tidak dikenali."""
+    upper_col = str(header).strip().upper().replace(" ", "_").replace("-", "_")
+    for target, keys in ROSTER_RULES:
+        if any(k in upper_col for k in keys): return target
+    return None
+
+def resolve_roster_columns(headers):
+    # {posisi kolom: nama kanonik}; jika dua header terpetakan ke nama yang sama, yang pertama dipakai
+    mapping, seen = {}, set()
+    for i, h in enumerate(headers):
+        target = map_roster_column(h) if h is not None else None
+        if target and target not in seen: mapping[i] = target; seen.add(target)
+    return mapping
+
+def resolve_calendar_columns(headers):
+    mapping = {}
+    for i, h in enumerate(headers):
+        name = str(h).strip() if h is not None else ""
+        if name in CALENDAR_COLS and name not in mapping.values(): mapping[i] = name
+    return mapping
+
+# --- XLSX: openpyxl read-only, baris header dibaca terpisah sebelum isi ---
+def _convert_cell(v):
+    # Sama dengan reader openpyxl milik pandas: float bulat jadi int (NIP/No tidak berakhiran ".0")
+    if isinstance(v, float) and v.is_integer(): return int(v)
+    return v
+
+@timed("ingest.read_xlsx")
+def _read_xlsx(data, resolve, as_str):
+    wb = load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        header = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
+        mapping = resolve(header)
+        cols = sorted(mapping)
+        rows = []
+        for row in ws.iter_rows(min_row=2, values_only=True):
+            vals = [_convert_cell(row[i]) if i < len(row) else None for i in cols]
+            if as_str: vals = [None if v is None else str(v) for v in vals]
+            rows.append(vals)
+    finally: wb.close()
+    while rows and all(v is None for v in rows[-1]): rows.pop()   # baris kosong di akhir sheet (format saja)
+    if as_str: return pd.DataFrame(rows, columns=[mapping[i] for i in cols], dtype=str)
+    # Sel kosong = NaN (bukan None) dan tipe kolom disimpulkan seperti pd.read_excel, supaya astype(str) di jalur
+    # tulis kalender/log tetap menghasilkan "nan" dan kolom tanggal menjadi datetime64
+    df = pd.DataFrame(rows, columns=[mapping[i] for i in cols], dtype=object)
+    return df.where(df.notna(), np.nan).infer_objects()
+
+# --- CSV: jalur cepat parser C pandas, hanya kolom terpetakan ---
+@timed("ingest.read_csv")
+def _read_csv(data, resolve):
+    text_head = data[:64 * 1024].decode("utf-8-sig", errors="replace")
+    first_line = text_head.splitlines()[0] if text_head else ""
+    try: sep = csv.Sniffer().sniff(first_line, delimiters=CSV_DELIMITERS).delimiter
+    except csv.Error: sep = ","
+    header = next(csv.reader([first_line], delimiter=sep), [])
+    mapping = resolve(header)
+    cols = sorted(mapping)
+    for enc in CSV_ENCODINGS:
+        try: df = pd.read_csv(io.BytesIO(data), sep=sep, dtype=str, usecols=cols, encoding=enc); break
+        except UnicodeDecodeError:
+            if enc == CSV_ENCODINGS[-1]: raise
+    return df.rename(columns={df.columns[k]: mapping[i] for k, i in enumerate(cols)})
+
+def _read(data, file_name, resolve, as_str):
+    if _is_csv(file_name): return _read_csv(data, resolve)
+    return _read_xlsx(data, resolve, as_str)
+
+# =============================================================================
+# API PUBLIK (DI-CACHE BERDASARKAN HASH ISI FILE)
+# =============================================================================
+@st.cache_data(show_spinner="Membaca file...", max_entries=INGEST_CACHE_ENTRIES)
+def _load_roster(digest, _data, file_name):
+    return _read(_data, file_name, resolve_roster_columns, as_str=True)
+
+@st.cache_data(show_spinner="Membaca file...", max_entries=INGEST_CACHE_ENTRIES)
+def _load_calendar(digest, _data, file_name):
+    return _read(_data, file_name, resolve_calendar_columns, as_str=False)
+
+def load_roster(uploaded_file):
+    """DataFrame peserta (semua nilai string/NaN) dengan kolom kanonik NAMA, NIP, PANGKAT, SATKER, TEMPAT,
+    JUDUL_PELATIHAN, TANGGAL_PELATIHAN yang ditemukan. Kolom lain tidak dibaca. Rerun dengan file yang
+    sama tidak mem-parse ulang."""
+    data = uploaded_file.getvalue()
+    return _load_roster(file_digest(data), data, uploaded_file.name)
+
+def load_calendar(uploaded_file):
+    """DataFrame kalender berisi kolom CALENDAR_COLS yang ada di file (tanggal Excel tetap datetime)."""
+    data = uploaded_file.getvalue()
+    return _load_calendar(file_digest(data), data, uploaded_file.name)
@@ -0,0 +1,125 @@
+import re
+import unicodedata
+from collections import Counter
+
+import pandas as pd
+
+# =============================================================================
+# LOGIKA KALENDER BERSAMA (DIPAKAI BACKEND SHEETS & SQLITE)
+# =============================================================================
+KOLOM_KALENDER = ['ID', 'JUDUL_PELATIHAN', 'RENCANA_TANGGAL', 'LOKASI', 'STATUS', 'REALISASI']
+
+def row_ranges(rows):
+    # Gabungkan nomor baris berurutan menjadi blok (awal, akhir) agar range update sesedikit mungkin
+    blok = []
+    for r in sorted(rows):
+        if blok and r == blok[-1][1] + 1: blok[-1][1] = r
+        else: blok.append([r, r])
+    return blok
+
+def plan_calendar_upsert(df_old, rows):
+    """Rencana upsert berbasis diff. rows = [(judul, rencana, lokasi)] dari upload; df_old = isi kalender saat ini.
+    Return {'changed': {posisi_baris_lama: [rencana, lokasi]}, 'inserted': [baris KOLOM_KALENDER], 'summary': {...}}.
+    Judul lama yang berubah di-update, judul baru di-append dengan ID lanjutan, judul ganda di upload: baris terakhir."""
+    if not df_old.empty: df_old = df_old.astype(str)
+
+    last_id = 0
+    if not df_old.empty and 'ID' in df_old.columns:
+        try:
+            numeric_ids = pd.to_numeric(df_old['ID'], errors='coerce').fillna(0)
+            last_id = int(numeric_ids.max())
+        except: pass
+
+    # Indeks hash judul -> posisi baris lama (baris pertama jika judul ganda)
+    index_lama = {}
+    if not df_old.empty:
+        for i, judul in enumerate(df_old['JUDUL_PELATIHAN'].tolist()): index_lama.setdefault(judul, i)
+
+    baru = {}
+    for judul, rencana, lokasi in rows: baru[str(judul)] = (str(rencana), str(lokasi))
+    summary = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'duplicates': len(rows) - len(baru)}
+
+    changed = {}; inserted_rows = []
+    old_rencana = df_old['RENCANA_TANGGAL'].tolist() if 'RENCANA_TANGGAL' in df_old.columns else []
+    old_lokasi = df_old['LOKASI'].tolist() if 'LOKASI' in df_old.columns else []
+    for judul, (rencana, lokasi) in baru.items():
+        pos = index_lama.get(judul)
+        if pos is None:
+            last_id += 1
+            inserted_rows.append([last_id, judul, rencana, lokasi, "Pending", "-"])
+        elif pos < len(old_rencana) and pos < len(old_lokasi) and (old_rencana[pos], old_lokasi[pos]) == (rencana, lokasi):
+            summary['unchanged'] += 1
+        else:
+            changed[pos] = [rencana, lokasi]
+    summary['updated'] = len(changed); summary['inserted'] = len(inserted_rows)
+    return {'changed': changed, 'inserted': inserted_rows, 'summary': summary}
+
+# =============================================================================
+# INDEKS JUDUL: NORMALISASI + KEMIRIPAN TRIGRAM (PENCOCOKAN JUDUL UPLOAD -> KALENDER)
+# =============================================================================
+MATCH_THRESHOLD = 0.6    # kemiripan trigram minimal agar judul ditawarkan sebagai 'mirip' (tetap perlu konfirmasi user)
+SUGGEST_THRESHOLD = 0.3  # di bawah MATCH_THRESHOLD tapi di atas ini: hanya ditampilkan sebagai saran
+_ROMAWI = re.compile(r"^(x{0,3})(ix|iv|v?i{0,3})$")   # I..XXXIX (angkatan, tingkat); "di", "mix" dst. tidak ikut
+_NILAI_ROMAWI = {'i': 1, 'v': 5, 'x': 10}
+
+def normalize_title(judul):
+    """Bentuk baku judul: huruf kecil, tanpa aksen/tanda baca, spasi tunggal ("Diklat  Teknis-Kepabeanan." -> "diklat teknis kepabeanan")."""
+    teks = unicodedata.normalize("NFKD", str(judul)).encode("ascii", "ignore").decode("ascii").casefold()
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", teks).split())
+
+def _roman(kata):
+    nilai = [_NILAI_ROMAWI[c] for c in kata]
+    return sum(-v if i + 1 < len(nilai) and v < nilai[i + 1] else v for i, v in enumerate(nilai))
+
+def number_tokens(norm):
+    """Token angka & angka romawi dari judul baku sebagai tuple terurut ("angkatan ii 2025" -> (2, 2025)).
+    Judul dengan angka berbeda (angkatan, tahun) tidak pernah dianggap jadwal yang sama."""
+    return tuple(sorted(int(k) if k.isdigit() else _roman(k) for k in norm.split() if k.isdigit() or (k and _ROMAWI.match(k))))
+
+def _trigrams(norm):
+    # Per kata, diberi padding seperti pg_trgm sehingga awal kata punya bobot lebih
+    return {g for kata in norm.split() for p in [f"  {kata} "] for g in (p[i:i + 3] for i in range(len(p) - 2))}
+
+def build_title_index(df_cal):
+    """Indeks kalender: judul baku -> posisi baris (baris pertama jika ganda), posting trigram -> posisi, token angka per baris."""
+    judul = df_cal['JUDUL_PELATIHAN'].astype(str).tolist() if not df_cal.empty and 'JUDUL_PELATIHAN' in df_cal.columns else []
+    ids = df_cal['ID'].astype(str).tolist() if judul and 'ID' in df_cal.columns else [""] * len(judul)
+    index = {'judul': judul, 'ids': ids, 'exact': {}, 'norm': {}, 'grams': [], 'angka': [], 'postings': {}}
+    for pos, j in enumerate(judul):
+        index['exact'].setdefault(j, pos)
+        norm = normalize_title(j); index['norm'].setdefault(norm, pos)
+        grams = _trigrams(norm); index['grams'].append(len(grams)); index['angka'].append(number_tokens(norm))
+        for g in grams: index['postings'].setdefault(g, []).append(pos)
+    return index
+
+def _best_fuzzy(index, norm):
+    # Kandidat dengan token angka sama didahulukan; return (posisi, skor, angka_sama)
+    grams = _trigrams(norm)
+    if not grams: return None, 0.0, False
+    angka = number_tokens(norm)
+    shared = Counter(pos for g in grams for pos in index['postings'].get(g, ()))
+    best, kunci = None, (False, 0.0)
+    for pos, n in shared.items():
+        k = (index['angka'][pos] == angka, n / (len(grams) + index['grams'][pos] - n))   # Jaccard himpunan trigram
+        if k > kunci or (k == kunci and best is not None and pos < best): best, kunci = pos, k
+    return best, kunci[1], kunci[0]
+
+def resolve_titles(titles, index, threshold=MATCH_THRESHOLD):
+    """Cocokkan semua judul unik sekaligus. Return {judul_upload: {'id', 'pos', 'kandidat_id', 'judul_kalender', 'skor', 'metode'}}.
+    Hanya metode 'persis' dan 'normalisasi' yang mengisi 'id'/'pos' (boleh langsung ditandai Selesai). Hasil kemiripan
+    trigram -- 'mirip' (skor >= threshold dan token angka sama) atau 'saran' -- hanya mengisi 'kandidat_id' dan
+    harus dikonfirmasi user; 'tidak ada' = tanpa kandidat."""
+    hasil = {}
+    for judul in dict.fromkeys(str(t) for t in titles):
+        norm = normalize_title(judul)
+        if judul in index['exact']: pos, skor, metode = index['exact'][judul], 1.0, 'persis'
+        elif norm and norm in index['norm']: pos, skor, metode = index['norm'][norm], 1.0, 'normalisasi'
+        else:
+            pos, skor, angka_sama = _best_fuzzy(index, norm)
+            metode = 'mirip' if skor >= threshold and angka_sama else 'saran' if skor >= SUGGEST_THRESHOLD else 'tidak ada'
+            if metode == 'tidak ada': pos = None
+        pasti = metode in ('persis', 'normalisasi')
+        hasil[judul] = {'id': index['ids'][pos] if pasti else None, 'pos': pos if pasti else None,
+                        'kandidat_id': index['ids'][pos] if pos is not None else None,
+                        'judul_kalender': index['judul'][pos] if pos is not None else None, 'skor': round(skor, 3), 'metode': metode}
+    return hasil
@@ -0,0 +1,106 @@
+import datetime
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+import streamlit as st
+
+from history_mirror import HISTORY_DB, DATA_DIR, append_local_history, clear_local_history
+from kalender import KOLOM_KALENDER, build_title_index, plan_calendar_upsert, resolve_titles
+
+# =============================================================================
+# BACKEND SQLITE (KALENDER + LOG PESERTA) - PENYIMPANAN UTAMA ATAU SALINAN OFFLINE
+# =============================================================================
+# Satu file dengan mirror log (history_mirror.py): tabel history sudah punya indeks NIP & DIKLAT
+LOCAL_DB = HISTORY_DB
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS calendar (row_no INTEGER PRIMARY KEY, ID TEXT, JUDUL_PELATIHAN TEXT, RENCANA_TANGGAL TEXT,
+                                     LOKASI TEXT, STATUS TEXT, REALISASI TEXT);
+CREATE INDEX IF NOT EXISTS idx_calendar_judul ON calendar (JUDUL_PELATIHAN);
+"""
+
+def _connect():
+    os.makedirs(DATA_DIR, exist_ok=True)
+    con = sqlite3.connect(LOCAL_DB, timeout=30)
+    con.executescript(_SCHEMA)
+    return con
+
+@st.cache_resource(show_spinner=False)
+def _get_lock():
+    return threading.Lock()
+
+# --- KALENDER ---
+def read_calendar_df():
+    """Isi kalender lokal dengan bentuk sama seperti read_sheet_df(SHEET_KALENDER) (DataFrame kosong jika belum ada baris)."""
+    con = _connect()
+    try: df = pd.read_sql_query(f"SELECT {', '.join(KOLOM_KALENDER)} FROM calendar ORDER BY row_no", con)
+    finally: con.close()
+    return df if not df.empty else pd.DataFrame()
+
+def replace_calendar(df):
+    """Ganti seluruh salinan kalender lokal dengan df (snapshot terbaru dari Sheets)."""
+    rows = [[str(df[c].iloc[i]) if c in df.columns else "" for c in KOLOM_KALENDER] for i in range(len(df))]
+    with _get_lock():
+        con = _connect()
+        try:
+            con.execute("DELETE FROM calendar")
+            con.executemany(f"INSERT INTO calendar (row_no, {', '.join(KOLOM_KALENDER)}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            [[i] + r for i, r in enumerate(rows, start=1)])
+            con.commit()
+        finally: con.close()
+
+def upsert_calendar_rows(rows):
+    """Versi lokal gsheet.upsert_calendar_rows(): rencana diff yang sama, diterapkan ke tabel calendar."""
+    with _get_lock():
+        df_old = read_calendar_df()
+        plan = plan_calendar_upsert(df_old, rows)
+        con = _connect()
+        try:
+            con.executemany("UPDATE calendar SET RENCANA_TANGGAL = ?, LOKASI = ? WHERE row_no = ?",
+                            [(rencana, lokasi, pos + 1) for pos, (rencana, lokasi) in plan['changed'].items()])
+            con.executemany(f"INSERT INTO calendar (row_no, {', '.join(KOLOM_KALENDER)}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            [[len(df_old) + i] + [str(v) for v in r] for i, r in enumerate(plan['inserted'], start=1)])
+            con.commit()
+        finally: con.close()
+        return plan['summary']
+
+def _mark_rows_complete(con, row_nos):
+    current_time = datetime.datetime.now().strftime("%d-%m-%Y")
+    con.executemany("UPDATE calendar SET STATUS = 'Selesai', REALISASI = ? WHERE row_no = ?", [(current_time, r) for r in sorted(set(row_nos))])
+
+def mark_ids_complete(ids):
+    """Versi lokal gsheet.mark_ids_complete(): baris pertama tiap ID ditandai 'Selesai'."""
+    ids = list(dict.fromkeys(str(i) for i in ids))
+    with _get_lock():
+        con = _connect()
+        try:
+            found = dict(con.execute(f"SELECT ID, MIN(row_no) FROM calendar WHERE ID IN ({', '.join('?' * len(ids))}) GROUP BY ID", ids).fetchall()) if ids else {}
+            _mark_rows_complete(con, found.values()); con.commit()
+        finally: con.close()
+    return {'matched': [i for i in ids if i in found], 'unmatched': [i for i in ids if i not in found]}
+
+def mark_trainings_complete(judul_list):
+    """Versi lokal gsheet.mark_trainings_complete(): judul dicocokkan lewat indeks judul (hanya persis / normalisasi), baris pertama ditandai 'Selesai'."""
+    judul_list = list(dict.fromkeys(judul_list))
+    with _get_lock():
+        df = read_calendar_df()
+        hasil = resolve_titles(judul_list, build_title_index(df)) if judul_list else {}
+        matched = [j for j in judul_list if hasil[str(j)]['pos'] is not None]
+        con = _connect()
+        try: _mark_rows_complete(con, [hasil[str(j)]['pos'] + 1 for j in matched]); con.commit()
+        finally: con.close()
+    return {'matched': matched, 'unmatched': [j for j in judul_list if j not in matched]}
+
+def reset_calendar_status():
+    with _get_lock():
+        con = _connect()
+        try:
+            n = con.execute("UPDATE calendar SET STATUS = 'Pending', REALISASI = '-'").rowcount; con.commit()
+            return n
+        finally: con.close()
+
+# --- LOG PESERTA (TABEL history MILIK history_mirror.py) ---
+def append_history_rows(rows): append_local_history(rows)
+
+def clear_history(): clear_local_history()
@@ -0,0 +1,76 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+# =============================================================================
+# DEKODE NIP (18 DIGIT: YYYYMMDD LAHIR + YYYYMM TMT + KODE GENDER + NO URUT)
+# =============================================================================
+GENDER_LABEL = {'1': "Pria", '2': "Wanita"}
+GENDER_UNKNOWN = "Tidak Diketahui"
+MIN_BIRTH_YEAR = 1950
+
+# --- VERSI PER-NILAI (DIPAKAI UNTUK SATU NIP / PEMBANDING BENCHMARK) ---
+def calculate_age_from_nip(nip_str):
+    try:
+        clean_nip = str(nip_str).replace(" ", "").replace(".", "").replace("-", "")
+        year_str = clean_nip[:4]
+        if year_str.isdigit():
+            birth_year = int(year_str); current_year = datetime.datetime.now().year
+            if MIN_BIRTH_YEAR <= birth_year <= current_year: return current_year - birth_year
+        return None
+    except: return None
+
+def get_gender_from_nip(nip_str):
+    try:
+        clean_nip = str(nip_str).replace(" ", "").replace(".", "").replace("-", "")
+        if len(clean_nip) >= 15:
+            code = clean_nip[14]; return "Pria" if code == '1' else "Wanita" if code == '2' else "Tidak Diketahui"
+        return "Tidak Diketahui"
+    except: return "Tidak Diketahui"
+
+# --- VERSI KOLOM (SATU KALI OPERASI STRING PANDAS UNTUK SELURUH ROSTER) ---
+def parse_nip_column(nip, now=None):
+    """Dekode seluruh kolom NIP sekaligus. Return DataFrame (index sama dengan nip) berisi:
+    NIP_BERSIH, TAHUN_LAHIR, TANGGAL_LAHIR, TAHUN_TMT, KODE_GENDER, USIA, GENDER dan NIP_VALID
+    (18 digit, tanggal lahir & TMT masuk akal, kode gender 1/2). USIA dan GENDER sama persis dengan
+    calculate_age_from_nip / get_gender_from_nip per baris."""
+    current_year = (now or datetime.datetime.now()).year
+    clean = nip.astype(str).str.replace(r"[ .\-]", "", regex=True)
+
+    # Jalur cepat: NIP 18 digit di-cast sekali ke int64 lalu setiap bagian diambil dengan aritmetika
+    is_18 = clean.str.fullmatch(r"[0-9]{18}").fillna(False).astype(bool).to_numpy()
+    angka = clean.where(is_18, "0").astype("int64").to_numpy()
+    tahun_lahir = np.where(is_18, angka // 10**14, np.nan)
+    bulan_lahir = angka // 10**12 % 100; hari_lahir = angka // 10**10 % 100
+    tahun_tmt = np.where(is_18, angka // 10**6 % 10000, np.nan)
+    bulan_tmt = angka // 10**4 % 100
+    kode_gender = np.where(is_18, angka // 1000 % 10, np.nan)
+
+    # Jalur umum (NIP tidak 18 digit, biasanya sedikit): aturan lama per string
+    lain = ~is_18
+    if lain.any():
+        sisa = clean[lain]; year_str = sisa.str[:4]; kode_str = sisa.str[14:15].where(sisa.str.len() >= 15)
+        year_ok = year_str.str.fullmatch(r"[0-9]{1,4}").fillna(False).astype(bool)
+        tahun_lahir[lain] = year_str.where(year_ok).astype("float64").to_numpy()
+        kode_gender[lain] = kode_str.where(kode_str.str.fullmatch(r"[0-9]").fillna(False).astype(bool)).astype("float64").to_numpy()
+    tahun_lahir[(tahun_lahir < MIN_BIRTH_YEAR) | (tahun_lahir > current_year)] = np.nan
+
+    usia = pd.Series(current_year - tahun_lahir, index=nip.index)
+    if len(usia) and usia.notna().all(): usia = usia.astype(np.int64)
+    gender = pd.Series(np.select([kode_gender == 1, kode_gender == 2], [GENDER_LABEL['1'], GENDER_LABEL['2']], GENDER_UNKNOWN), index=nip.index).astype(str)
+
+    # Tanggal lahir (hanya NIP 18 digit dengan bulan/tanggal yang ada di kalender) dan flag validasi
+    kabisat = (angka // 10**14 % 4 == 0) & ((angka // 10**14 % 100 != 0) | (angka // 10**14 % 400 == 0))
+    hari_max = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])[np.clip(bulan_lahir, 0, 12)] + ((bulan_lahir == 2) & kabisat)
+    tgl_ok = is_18 & ~np.isnan(tahun_lahir) & (bulan_lahir >= 1) & (bulan_lahir <= 12) & (hari_lahir >= 1) & (hari_lahir <= hari_max)
+    tanggal = ((np.where(tgl_ok, angka // 10**14, 1970) - 1970).astype("datetime64[Y]").astype("datetime64[M]")
+               + np.where(tgl_ok, bulan_lahir - 1, 0)).astype("datetime64[D]") + np.where(tgl_ok, hari_lahir - 1, 0)
+    tanggal_lahir = pd.Series(np.where(tgl_ok, tanggal, np.datetime64("NaT")).astype("datetime64[ns]"), index=nip.index)
+    valid = (tgl_ok & ((kode_gender == 1) | (kode_gender == 2)) & (bulan_tmt >= 1) & (bulan_tmt <= 12)
+             & (tahun_tmt >= tahun_lahir) & (tahun_tmt <= current_year))
+
+    return pd.DataFrame({
+        'NIP_BERSIH': clean, 'TAHUN_LAHIR': tahun_lahir, 'TANGGAL_LAHIR': tanggal_lahir, 'TAHUN_TMT': tahun_tmt,
+        'KODE_GENDER': kode_gender, 'USIA': usia, 'GENDER': gender, 'NIP_VALID': valid,
+    }, index=nip.index)
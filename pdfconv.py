@@ -0,0 +1,117 @@
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import streamlit as st
+
+from perf import timed
+
+# =============================================================================
+# KONVERSI DOCX -> PDF (BATCH soffice --convert-to, LIBREOFFICE HEADLESS)
+# =============================================================================
+SOFFICE_BIN = os.environ.get("SOFFICE_BIN") or shutil.which("soffice") or shutil.which("libreoffice")
+PDF_WORKERS = int(os.environ.get("PDF_WORKERS", "2"))   # proses soffice paralel (masing-masing punya profil sendiri)
+PDF_BATCH = 50                                          # dokumen per pemanggilan soffice (startup LibreOffice dibayar per batch)
+PDF_TIMEOUT_BASE = 60                                   # detik per batch + PDF_TIMEOUT_PER_DOC per dokumen
+PDF_TIMEOUT_PER_DOC = 5
+PROFILE_DIR = os.environ.get("PDF_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "diklat_lo_profiles"))
+
+def pdf_available(): return bool(SOFFICE_BIN)
+
+# --- SLOT PROFIL (SATU SET PER PROSES) ---
+# Tidak ada instance LibreOffice yang tetap hidup: setiap batch (termasuk satu klik "Lampiran (.pdf)") menjalankan
+# soffice baru dan membayar startup-nya. Slot hanya membatasi paralelisme & menyimpan profil yang sudah dibuat.
+@st.cache_resource(show_spinner=False)
+def _get_state():
+    # Satu profil dipakai satu proses soffice pada satu waktu (profil LibreOffice tidak bisa dipakai bersama)
+    slots = queue.Queue(); size = max(1, PDF_WORKERS)
+    for i in range(size): slots.put(os.path.join(PROFILE_DIR, f"worker_{i}"))
+    return {'slots': slots, 'size': size, 'lock': threading.Lock(), 'warmed': False,
+            'docs': 0, 'seconds': 0.0, 'batches': 0, 'last_error': None}
+
+def _soffice_cmd(profile, outdir, files):
+    return [SOFFICE_BIN, f"-env:UserInstallation={Path(profile).as_uri()}", "--headless", "--invisible", "--nologo",
+            "--norestore", "--nodefault", "--nolockcheck", "--convert-to", "pdf:writer_pdf_Export", "--outdir", outdir, *files]
+
+def _warm_profile(profile):
+    # Start pertama LibreOffice dengan profil baru membuat profil (beberapa detik); dilakukan sekali per slot lalu dipakai ulang
+    if os.path.isdir(os.path.join(profile, "user")): return
+    os.makedirs(profile, exist_ok=True)
+    subprocess.run([SOFFICE_BIN, f"-env:UserInstallation={Path(profile).as_uri()}", "--headless", "--terminate_after_init"],
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=PDF_TIMEOUT_BASE * 2)
+
+def _convert_batch(state, docs):
+    """docs = [(nama, bytes_docx)] -> [bytes_pdf] sesuai urutan; satu proses soffice untuk seluruh batch."""
+    profile = state['slots'].get()
+    try:
+        _warm_profile(profile)
+        with tempfile.TemporaryDirectory(prefix="diklat_pdf_") as tmp:
+            files = []
+            for i, (_, data) in enumerate(docs):
+                path = os.path.join(tmp, f"{i:05d}.docx"); files.append(path)
+                with open(path, "wb") as f: f.write(data)
+            proc = subprocess.run(_soffice_cmd(profile, tmp, files), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                  timeout=PDF_TIMEOUT_BASE + PDF_TIMEOUT_PER_DOC * len(docs))
+            hasil = []
+            for path in files:
+                pdf = path[:-len(".docx")] + ".pdf"
+                if not os.path.exists(pdf):
+                    raise RuntimeError(f"Konversi PDF gagal (kode {proc.returncode}): {proc.stderr.decode(errors='replace')[-300:]}")
+                with open(pdf, "rb") as f: hasil.append(f.read())
+            return hasil
+    finally: state['slots'].put(profile)
+
+# =============================================================================
+# API PUBLIK
+# =============================================================================
+def pdf_name(nama_docx): return (nama_docx[:-len(".docx")] if nama_docx.lower().endswith(".docx") else nama_docx) + ".pdf"
+
+@timed("pdf.convert_many")
+def convert_many(docs):
+    """[(nama.docx, bytes)] -> [(nama.pdf, bytes)] sesuai urutan. Dokumen dibagi per PDF_BATCH; tiap batch satu proses
+    soffice, maksimal PDF_WORKERS proses paralel. Raise RuntimeError jika LibreOffice tidak tersedia/gagal."""
+    if not pdf_available(): raise RuntimeError("LibreOffice (soffice) tidak ditemukan di server; konversi PDF tidak tersedia.")
+    docs = list(docs)
+    if not docs: return []
+    state = _get_state(); t0 = time.perf_counter()
+    batches = [docs[i:i + PDF_BATCH] for i in range(0, len(docs), PDF_BATCH)]
+    try:
+        with ThreadPoolExecutor(max_workers=min(len(batches), state['size'])) as ex:
+            hasil = [pdf for batch in ex.map(lambda batch: _convert_batch(state, batch), batches) for pdf in batch]
+    except Exception as e:
+        state['last_error'] = str(e); raise
+    with state['lock']:
+        state['docs'] += len(docs); state['seconds'] += time.perf_counter() - t0; state['batches'] += len(batches)
+        state['last_error'] = None
+    return [(pdf_name(nama), pdf) for (nama, _), pdf in zip(docs, hasil)]
+
+def convert_docx(data, nama="Lampiran.docx"):
+    return convert_many([(nama, data)])[0][1]
+
+def pdf_stats():
+    """Throughput konversi sejak proses start: {'docs', 'seconds', 'batches', 'docs_per_sec', 'last_error'}."""
+    state = _get_state()
+    with state['lock']:
+        return {'docs': state['docs'], 'seconds': state['seconds'], 'batches': state['batches'], 'last_error': state['last_error'],
+                'docs_per_sec': state['docs'] / state['seconds'] if state['seconds'] else 0.0}
+
+def prepare_pdf_profiles():
+    """Buat profil LibreOffice semua slot di background (sekali per proses) supaya konversi pertama tidak ikut
+    menunggu pembuatan profil. Startup soffice per batch tetap dibayar."""
+    state = _get_state()
+    with state['lock']:
+        if not pdf_available() or state['warmed']: return
+        state['warmed'] = True
+    def _run():
+        profiles = [state['slots'].get() for _ in range(state['size'])]   # slot dipegang selama disiapkan
+        for profile in profiles:
+            try: _warm_profile(profile)
+            except Exception: pass
+            finally: state['slots'].put(profile)
+    threading.Thread(target=_run, name="pdf-profile-setup", daemon=True).start()
@@ -0,0 +1,132 @@
+import datetime
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from contextlib import contextmanager
+
+# =============================================================================
+# INSTRUMENTASI RINGAN: SPAN WAKTU + HITUNGAN PANGGILAN API PER RERUN
+# =============================================================================
+# Tanpa import streamlit di level modul supaya aman dipakai docgen di proses worker (spawn).
+# Span di luar rerun (thread worker antrian / proses lain) masuk ke bucket 'background'.
+PERF_PANEL = os.environ.get("DIKLAT_PERF") == "1"        # tab Performance selalu tampil (atau ?perf=1 di URL)
+PERF_LOG_FILE = os.environ.get("DIKLAT_PERF_LOG")        # jika diisi, tiap rerun selesai ditambahkan sebagai 1 baris JSON
+PERF_HISTORY = 200                                       # rerun terakhir yang disimpan di memori (semua sesi)
+BACKGROUND_SPANS = 500
+
+_store = {'lock': threading.Lock(), 'reruns': deque(maxlen=PERF_HISTORY), 'active': {},
+          'background': {'spans': deque(maxlen=BACKGROUND_SPANS), 'api_calls': Counter()}}
+_local = threading.local()   # kedalaman span per thread
+
+def _now(): return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+def _session_id():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx(suppress_warning=True)
+        return ctx.session_id if ctx else None
+    except Exception: return None
+
+def _active_key():
+    # Rerun Streamlit berjalan di thread skrip milik sesi; di luar Streamlit (benchmark) per thread
+    return _session_id() or f"thread-{threading.get_ident()}"
+
+def _active():
+    if not _store['active']: return None
+    return _store['active'].get(_active_key())
+
+def _finish(rec, selesai):
+    rec['total_ms'] = round((time.perf_counter() - rec.pop('_t0')) * 1000, 2); rec['completed'] = selesai
+    rec['api_calls'] = dict(rec['api_calls'])
+    with _store['lock']: _store['reruns'].append(rec)
+    if PERF_LOG_FILE:
+        try:
+            with open(PERF_LOG_FILE, "a", encoding="utf-8") as f: f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        except OSError: pass
+
+# --- SIKLUS RERUN ---
+def begin_rerun(label="app"):
+    """Mulai rekaman rerun baru untuk sesi ini. Rerun sebelumnya yang terputus (st.rerun / exception)
+    ditutup dengan completed=False."""
+    key = _active_key()
+    rec = {'id': uuid.uuid4().hex[:12], 'session': _session_id(), 'label': label, 'started': _now(),
+           'version': os.environ.get("DIKLAT_VERSION"), '_t0': time.perf_counter(), 'spans': [], 'api_calls': Counter()}
+    with _store['lock']: prev = _store['active'].pop(key, None); _store['active'][key] = rec
+    if prev is not None: _finish(prev, False)
+    _local.depth = 0
+
+def end_rerun():
+    with _store['lock']: rec = _store['active'].pop(_active_key(), None)
+    if rec is not None: _finish(rec, True)
+
+# --- SPAN & HITUNGAN API ---
+@contextmanager
+def span(name, **meta):
+    """Catat durasi blok: with span("docgen.word", rows=len(df)): ..."""
+    rec = _active()
+    depth = getattr(_local, 'depth', 0); _local.depth = depth + 1
+    t0 = time.perf_counter(); error = None
+    try: yield
+    except BaseException as e:
+        error = type(e).__name__; raise
+    finally:
+        _local.depth = depth
+        item = {'name': name, 'ms': round((time.perf_counter() - t0) * 1000, 2), 'depth': depth, **meta}
+        if error: item['error'] = error
+        if rec is not None:
+            item['at_ms'] = round((t0 - rec['_t0']) * 1000, 2); rec['spans'].append(item)
+        else:
+            item['at'] = _now(); item['thread'] = threading.current_thread().name
+            with _store['lock']: _store['background']['spans'].append(item)
+
+def timed(name=None):
+    """Dekorator span; nama default modul.fungsi."""
+    def wrap(fn):
+        label = name or f"{fn.__module__}.{fn.__name__}"
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            with span(label): return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+def count_api(op, n=1):
+    """Tambah hitungan panggilan API (mis. 'sheets.get_all_records') ke rerun aktif atau bucket background."""
+    rec = _active()
+    if rec is not None: rec['api_calls'][op] += n; return
+    with _store['lock']: _store['background']['api_calls'][op] += n
+
+# --- BACA & EKSPOR ---
+def recent_reruns(session=None, limit=None):
+    """Rerun yang sudah selesai (terbaru di akhir); session=None = semua sesi."""
+    with _store['lock']: recs = [r for r in _store['reruns'] if session is None or r['session'] == session]
+    return recs[-limit:] if limit else recs
+
+def current_session(): return _session_id()
+
+def background_activity():
+    with _store['lock']:
+        return {'spans': list(_store['background']['spans']), 'api_calls': dict(_store['background']['api_calls'])}
+
+def span_summary(reruns):
+    """Ringkasan per nama span: jumlah, total, rata-rata, p95 dan maksimum (ms)."""
+    per_nama = {}
+    for rec in reruns:
+        for s in rec['spans']: per_nama.setdefault(s['name'], []).append(s['ms'])
+    rows = []
+    for nama, ms in per_nama.items():
+        ms = sorted(ms)
+        rows.append({'SPAN': nama, 'JUMLAH': len(ms), 'TOTAL_MS': round(sum(ms), 2), 'RATA_MS': round(sum(ms) / len(ms), 2),
+                     'P95_MS': ms[min(len(ms) - 1, int(round(0.95 * (len(ms) - 1))))], 'MAKS_MS': ms[-1]})
+    return sorted(rows, key=lambda r: r['TOTAL_MS'], reverse=True)
+
+def export_jsonl(reruns):
+    """Rerun sebagai JSON lines (satu rerun per baris) untuk dibandingkan antar deployment."""
+    return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in reruns).encode("utf-8")
+
+def clear_perf():
+    with _store['lock']:
+        _store['reruns'].clear(); _store['background']['spans'].clear(); _store['background']['api_calls'].clear()
@@ -0,0 +1,127 @@
+import os
+import threading
+
+import streamlit as st
+
+import gsheet
+import local_store
+from gsheet import SHEET_KALENDER, connect_to_gsheet, read_sheet_df, sheet_version
+from history_mirror import record_local_history, reset_history_mirror, sync_history
+from kalender import build_title_index, resolve_titles
+from write_queue import (enqueue_calendar_reset, enqueue_calendar_upsert, enqueue_completion, enqueue_history,
+                         enqueue_history_clear, pending_kinds)
+
+# =============================================================================
+# LAPISAN PENYIMPANAN: BACKEND SHEETS (DENGAN SALINAN SQLITE) ATAU SQLITE SAJA
+# =============================================================================
+# 'sheets' = Google Sheets utama; salinan SQLite dipakai saat Sheets tidak bisa diakses dan perubahan
+#            selama offline diantrikan ke write_queue sampai koneksi kembali.
+# 'local'  = SQLite sebagai penyimpanan utama, Sheets tidak disentuh (jalan lokal / test).
+STORAGE_MODE = os.environ.get("STORAGE_MODE", "sheets").strip().lower()
+STORAGE_MODES = ('sheets', 'local')
+if STORAGE_MODE not in STORAGE_MODES: raise ValueError(f"STORAGE_MODE harus salah satu dari {STORAGE_MODES}: {STORAGE_MODE}")
+
+# Keterangan tujuan penulisan untuk pesan di UI
+TUJUAN_SIMPAN = {'sheets': "", 'local': " (penyimpanan lokal)", 'queued': " (offline: disimpan lokal, dikirim ke Sheets saat koneksi kembali)"}
+
+@st.cache_resource(show_spinner=False)
+def _get_state():
+    return {'lock': threading.Lock(), 'snapshot_version': None}
+
+def is_local(): return STORAGE_MODE == 'local'
+
+def is_online(): return not is_local() and connect_to_gsheet() is not None
+
+def storage_status():
+    """{'mode', 'online', 'offline'}; offline = mode sheets tetapi Sheets tidak bisa diakses (pakai salinan lokal)."""
+    online = is_online()
+    return {'mode': STORAGE_MODE, 'online': online, 'offline': not is_local() and not online}
+
+# --- KALENDER ---
+def _snapshot(df):
+    # Salinan lokal diperbarui sekali per versi cache Sheets; ditahan selama ada perubahan offline yang belum terkirim
+    state = _get_state(); version = sheet_version(SHEET_KALENDER)
+    with state['lock']:
+        if state['snapshot_version'] == version: return
+        if pending_kinds() & {'calendar_upsert', 'calendar_reset'}: return
+        local_store.replace_calendar(df); state['snapshot_version'] = version
+
+def read_calendar():
+    """DataFrame kalender dari backend aktif; di mode sheets jatuh ke salinan lokal jika Sheets gagal dibaca."""
+    if is_online():
+        try:
+            df = read_sheet_df(SHEET_KALENDER)
+            _snapshot(df); return df
+        except Exception:
+            if local_store.read_calendar_df().empty: raise
+    return local_store.read_calendar_df()
+
+def upsert_calendar(rows):
+    """Upsert [(judul, rencana, lokasi)]. Return (ringkasan, tujuan) dengan tujuan 'sheets', 'local' atau 'queued'
+    (offline: diterapkan ke salinan lokal dan diantrikan ke Sheets)."""
+    if is_local(): return local_store.upsert_calendar_rows(rows), 'local'
+    if is_online():
+        try: return gsheet.upsert_calendar_rows(rows), 'sheets'
+        except Exception: pass   # upsert per judul aman diulang, jadi cukup diantrikan
+    summary = local_store.upsert_calendar_rows(rows)
+    enqueue_calendar_upsert(rows)
+    return summary, 'queued'
+
+def match_titles(titles, df_cal=None):
+    """Cocokkan judul upload ke kalender dalam satu batch (lihat kalender.resolve_titles)."""
+    return resolve_titles(titles, build_title_index(read_calendar() if df_cal is None else df_cal))
+
+def complete_trainings(titles, confirmed=None):
+    """Tandai judul 'Selesai' lewat ID hasil match_titles (hanya judul persis / normalisasi) atau ID kandidat yang
+    dikonfirmasi user di preview (confirmed = {judul: id}; hasil kemiripan tidak pernah dipakai tanpa konfirmasi).
+    Judul tanpa ID (tidak cocok / kalender gagal dibaca) dikirim apa adanya dan dicocokkan ulang oleh backend
+    terhadap kalender terbaru (juga hanya persis / normalisasi). Mode sheets: lewat antrian tulis + salinan lokal
+    langsung diperbarui. Return hasil pencocokan {judul: {...}}."""
+    if not titles: return {}
+    confirmed = {str(j): str(i) for j, i in (confirmed or {}).items()}
+    try: hasil = match_titles(titles)
+    except Exception: hasil = {str(t): {'id': None, 'metode': 'tidak ada'} for t in titles}
+    for judul, h in hasil.items():
+        if h['id'] is None and judul in confirmed: h['id'] = confirmed[judul]
+    ids = list(dict.fromkeys(h['id'] for h in hasil.values() if h['id'] is not None))
+    sisa = [j for j, h in hasil.items() if h['id'] is None]
+    if ids: local_store.mark_ids_complete(ids)
+    if sisa: local_store.mark_trainings_complete(sisa)
+    if not is_local(): enqueue_completion(titles=sisa, ids=ids)
+    return hasil
+
+def reset_calendar():
+    """Semua status kalender -> Pending. Return (jumlah baris, tujuan)."""
+    if is_local(): return local_store.reset_calendar_status(), 'local'
+    if is_online():
+        try: return gsheet.reset_calendar_status(), 'sheets'
+        except Exception: pass
+    n = local_store.reset_calendar_status()
+    enqueue_calendar_reset()
+    return n, 'queued'
+
+# --- LOG PESERTA ---
+def log_history(df_log):
+    """Catat log peserta (kolom TIMESTAMP, NAMA, NIP, DIKLAT, SATKER). Mode sheets: diantrikan ke Sheet1 dan
+    langsung terlihat di indeks riwayat lokal; mode local: langsung masuk tabel history."""
+    rows = df_log.astype(str).values.tolist()
+    if is_local(): local_store.append_history_rows(rows); return
+    enqueue_history(rows)
+    record_local_history(df_log)
+
+def clear_history():
+    """Kosongkan log peserta. Return tujuan ('sheets', 'local' atau 'queued')."""
+    if is_local(): local_store.clear_history(); return 'local'
+    if is_online():
+        try:
+            gsheet.clear_history_sheet(); reset_history_mirror()
+            return 'sheets'
+        except Exception: pass
+    local_store.clear_history()
+    enqueue_history_clear()
+    return 'queued'
+
+def refresh_history(force=False):
+    """Tarik log baru dari Sheets ke mirror lokal (tidak ada apa-apa di mode local / saat offline)."""
+    if not is_online(): return 0
+    return sync_history(force=force)
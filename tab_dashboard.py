@@ -0,0 +1,42 @@
+import streamlit as st
+
+from dashboard import dashboard_aggregates, gender_pie_spec, breakdown_bar_spec
+from storage import read_calendar
+
+# =============================================================================
+# TAB DASHBOARD (DI-IMPORT & DIJALANKAN HANYA SAAT TAB DIBUKA)
+# =============================================================================
+def render(df_edited=None):
+    """df_edited = roster hasil tab Generator (None jika belum ada file)."""
+    if df_edited is not None:
+        agg = dashboard_aggregates(df_edited)   # dihitung ulang hanya jika isi data berubah
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("Total Peserta", agg['total'])
+        c2.metric("Jumlah Pelatihan", agg['pelatihan'])
+        c3.metric("Rata-rata Usia", f"{agg['avg_usia']:.0f} Tahun" if agg['avg_usia'] is not None else "-")
+        c4.metric("Satker", agg['satker'])
+        st.markdown("---")
+        col_g1, col_g2 = st.columns(2)
+        with col_g1:
+            if agg['usia_counts'] is not None: st.bar_chart(agg['usia_counts'], color="#3498DB")
+        with col_g2:
+            if agg['gender_counts'] is not None and not agg['gender_counts'].empty:
+                st.vega_lite_chart(agg['gender_counts'], gender_pie_spec(), use_container_width=True)
+        col_g3, col_g4 = st.columns(2)
+        with col_g3:
+            if agg['satker_counts'] is not None and not agg['satker_counts'].empty:
+                st.markdown("###### Peserta per Satker"); st.vega_lite_chart(agg['satker_counts'], breakdown_bar_spec("Satker"), use_container_width=True)
+        with col_g4:
+            if agg['pangkat_counts'] is not None and not agg['pangkat_counts'].empty:
+                st.markdown("###### Peserta per Pangkat"); st.vega_lite_chart(agg['pangkat_counts'], breakdown_bar_spec("Pangkat", "#1ABC9C"), use_container_width=True)
+
+    st.markdown("#### 📅 Monitoring Realisasi Diklat 2026")
+    try:
+        df_cal = read_calendar()
+        if not df_cal.empty:
+            total_plan = len(df_cal)
+            total_done = len(df_cal[df_cal['STATUS'] == 'Selesai'])
+            progress = total_done / total_plan if total_plan > 0 else 0
+            st.progress(progress, text=f"Realisasi: {total_done} dari {total_plan} Pelatihan ({progress:.1%})")
+            st.dataframe(df_cal[['JUDUL_PELATIHAN', 'RENCANA_TANGGAL', 'LOKASI', 'STATUS', 'REALISASI']], use_container_width=True)
+    except: st.info("Data Kalender belum tersedia.")
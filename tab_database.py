@@ -0,0 +1,84 @@
+import streamlit as st
+
+from history_mirror import count_history, query_history, distinct_values, mirror_status
+from storage import TUJUAN_SIMPAN, storage_status, is_local, reset_calendar, clear_history, refresh_history
+from write_queue import flush_now, queue_status
+
+# =============================================================================
+# TAB DATABASE / DANGER ZONE (DI-IMPORT & DIJALANKAN HANYA SAAT TAB DIBUKA)
+# =============================================================================
+def reset_calendar_status():
+    try:
+        n, tujuan = reset_calendar()
+        if n: st.success(f"✅ Status Kalender berhasil di-reset menjadi 'Pending'{TUJUAN_SIMPAN[tujuan]}!")
+        else: st.warning("Data kalender kosong.")
+    except Exception as e: st.error(f"Gagal reset kalender: {e}")
+
+def clear_history_log():
+    try:
+        tujuan = clear_history()
+        st.success(f"✅ Log Peserta berhasil dikosongkan{TUJUAN_SIMPAN[tujuan]}!")
+    except Exception as e: st.error(f"Gagal hapus log: {e}")
+
+def render():
+    status_store = storage_status()
+    # Status antrian sinkronisasi (write-behind ke Google Sheets)
+    status_q = queue_status()
+    c_q1, c_q2, c_q3 = st.columns([1, 2, 1])
+    c_q1.metric("Antrian Sinkronisasi", f"{status_q['depth']} job", f"{status_q['rows']} baris log", delta_color="off")
+    with c_q2:
+        st.caption(f"Flush terakhir: {status_q['last_flush'] or '-'} — {status_q['last_status'] or 'belum ada'}")
+        if status_q['last_error']: st.caption(f"⚠️ {status_q['last_error']} (retry dalam {status_q['next_retry']} detik)")
+    with c_q3:
+        if st.button("🔁 Sinkronkan Sekarang", use_container_width=True, disabled=status_q['depth'] == 0): flush_now()
+
+    st.subheader("🔗 Log Peserta")
+    # Mirror lokal (SQLite): hanya baris baru yang ditarik dari Sheets, filter & paginasi di query lokal
+    if is_local(): st.caption("💾 Mode penyimpanan lokal (SQLite) — Google Sheets tidak dipakai.")
+    elif status_store['offline']: st.caption("📴 Google Sheets tidak terjangkau — menampilkan log lokal terakhir, perubahan diantrikan.")
+    try: refresh_history(force=st.button("🔄 Tarik Log Terbaru", disabled=not status_store['online']))
+    except Exception as e: st.warning(f"Sinkronisasi log gagal, menampilkan data lokal terakhir: {e}")
+    f1, f2, f3, f4 = st.columns(4)
+    f_diklat = f1.selectbox("DIKLAT", ["(Semua)"] + distinct_values('DIKLAT'))
+    f_satker = f2.selectbox("SATKER", ["(Semua)"] + distinct_values('SATKER'))
+    f_nip = f3.text_input("NIP (awalan)")
+    f_tgl = f4.date_input("Rentang Tanggal", value=(), format="DD/MM/YYYY")
+    filters = {'diklat': None if f_diklat == "(Semua)" else f_diklat, 'satker': None if f_satker == "(Semua)" else f_satker,
+               'nip': f_nip or None, 'date_from': f_tgl[0] if len(f_tgl) > 0 else None, 'date_to': f_tgl[-1] if len(f_tgl) > 0 else None}
+
+    p1, p2 = st.columns([1, 3])
+    page_size = p1.selectbox("Baris per halaman", [25, 50, 100, 250], index=1)
+    total_log = count_history(**filters)
+    total_page = max(1, -(-total_log // page_size))
+    page = p2.number_input(f"Halaman (dari {total_page})", min_value=1, max_value=total_page, value=1, step=1)
+    df_log = query_history(page=int(page), page_size=page_size, **filters)
+    st.dataframe(df_log, use_container_width=True, hide_index=True)
+    status_m = mirror_status()
+    st.caption(f"{total_log} baris sesuai filter • {status_m['synced_rows']} baris di mirror lokal • sinkron terakhir: {status_m['last_sync'] or '-'}")
+
+    st.markdown("---")
+    with st.expander("⚠️ DANGER ZONE / AREA BERBAHAYA"):
+        st.markdown("""<div class="danger-box">
+        <b>PERINGATAN:</b> Tindakan di bawah ini bersifat destruktif dan tidak dapat dibatalkan.
+        Harap berhati-hati sebelum menekan tombol reset.
+        </div>""", unsafe_allow_html=True)
+
+        c_d1, c_d2 = st.columns(2)
+
+        # FITUR 1: RESET STATUS KALENDER
+        with c_d1:
+            st.markdown("##### 1. Reset Status Kalender")
+            st.caption("Mengembalikan semua status pelatihan menjadi 'Pending'.")
+            confirm_cal = st.checkbox("Saya sadar ini akan mereset progress.", key="chk_cal")
+            if confirm_cal:
+                if st.button("🔴 RESET STATUS KALENDER", type="primary"):
+                    reset_calendar_status()
+
+        # FITUR 2: HAPUS LOG PESERTA
+        with c_d2:
+            st.markdown("##### 2. Hapus Log Peserta")
+            st.caption("Menghapus semua riwayat upload peserta (Sheet1).")
+            confirm_log = st.checkbox("Saya sadar data akan hilang permanen.", key="chk_log")
+            if confirm_log:
+                if st.button("🔴 HAPUS SEMUA LOG", type="primary"):
+                    clear_history_log()
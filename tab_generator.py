@@ -0,0 +1,203 @@
+import datetime
+
+import pandas as pd
+import streamlit as st
+
+from assets import template_bytes, template_file_name
+from nip import parse_nip_column
+from pdfconv import pdf_available, convert_docx, convert_many, pdf_stats
+
+# =============================================================================
+# TAB GENERATOR (SELALU DIRENDER: SUMBER DATA DASHBOARD & STATE UPLOADER)
+# =============================================================================
+# Modul berat (docgen/python-docx, ingest/openpyxl, storage/gspread) di-import di dalam fungsi,
+# baru saat file diupload atau dokumen diunduh, bukan saat app pertama dibuka.
+
+def save_to_cloud_callback(df_input, konfirmasi=None, file_id=None):
+    # konfirmasi = {judul_upload: id_kalender} kandidat kemiripan yang dicentang user di preview.
+    # Idempoten per upload: tiap (file_id, judul) hanya dicatat sekali, walau Lampiran, ZIP dan lampiran
+    # per pelatihan dari upload yang sama diunduh semua.
+    from storage import is_local, log_history, complete_trainings
+    current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    try:
+        data_to_save = df_input.copy()
+        target_cols = ['NAMA', 'NIP', 'JUDUL_PELATIHAN', 'SATKER']
+        final_cols = {}
+        for target in target_cols:
+            for col in data_to_save.columns:
+                if target in col:
+                    final_cols[col] = target if target != 'JUDUL_PELATIHAN' else 'DIKLAT'
+                    break
+        if final_cols:
+            data_to_save = data_to_save[list(final_cols.keys())].rename(columns=final_cols)
+            data_to_save.insert(0, 'TIMESTAMP', current_time)
+
+            terkirim = st.session_state.get('log_terkirim')
+            if not terkirim or terkirim['file_id'] != file_id: terkirim = st.session_state['log_terkirim'] = {'file_id': file_id, 'judul': set()}
+            judul = data_to_save['DIKLAT'].astype(str) if 'DIKLAT' in data_to_save.columns else pd.Series("", index=data_to_save.index)
+            data_to_save = data_to_save[~judul.isin(terkirim['judul'])]
+            if data_to_save.empty: st.toast("ℹ️ Log upload ini sudah tercatat sebelumnya.", icon="☁️"); return
+
+            # Mode sheets: ditulis ke antrian (journal lokal), worker background yang mengirim ke Google Sheets
+            log_history(data_to_save)
+            if 'DIKLAT' in data_to_save.columns: complete_trainings(data_to_save['DIKLAT'].unique().tolist(), konfirmasi)
+            terkirim['judul'].update(judul.loc[data_to_save.index])
+            st.toast("✅ Log tersimpan di penyimpanan lokal." if is_local() else "✅ Log masuk antrian sinkronisasi Cloud.", icon="☁️")
+    except Exception as e: st.toast(f"Error Database: {e}", icon="❌")
+
+def reset_app():
+    st.session_state['uploader_key'] += 1
+    st.rerun()
+
+# --- BUILD ON-DEMAND (ENGINE WORD: docgen.py) ---
+# Kunci cache = digest penuh isi data (ingest.frame_digest) + field TTD/ND; DataFrame dioper sebagai _df (tidak di-hash
+# Streamlit, yang hanya mengambil sampel baris untuk data besar sehingga editan bisa menghasilkan dokumen basi).
+@st.cache_data(show_spinner=False, max_entries=16)
+def _word_bytes(df_key, _df, nama_ttd, jabatan_ttd, no_nd_val, tgl_nd_val):
+    from docgen import generate_word_combined
+    return generate_word_combined(_df, nama_ttd, jabatan_ttd, no_nd_val, tgl_nd_val).getvalue()
+
+def build_word_bytes(df, nama_ttd, jabatan_ttd, no_nd_val, tgl_nd_val):
+    from ingest import frame_digest
+    return _word_bytes(frame_digest(df), df, nama_ttd, jabatan_ttd, no_nd_val, tgl_nd_val)
+
+# PDF dikonversi dari DOCX yang sama (batch soffice --convert-to di pdfconv.py; startup LibreOffice per batch)
+@st.cache_data(show_spinner=False, max_entries=16)
+def _pdf_bytes(df_key, _df, nama_ttd, jabatan_ttd, no_nd_val, tgl_nd_val):
+    return convert_docx(_word_bytes(df_key, _df, nama_ttd, jabatan_ttd, no_nd_val, tgl_nd_val))
+
+def build_pdf_bytes(df, nama_ttd, jabatan_ttd, no_nd_val, tgl_nd_val):
+    from ingest import frame_digest
+    return _pdf_bytes(frame_digest(df), df, nama_ttd, jabatan_ttd, no_nd_val, tgl_nd_val)
+
+# Arsip ZIP dibangun di file temp saat tombol diklik, lalu dibaca sekali jadi bytes untuk st.download_button.
+# Streamlit (>= 1.55) selalu mengubah data unduhan menjadi satu objek bytes di media manager-nya dan belum bisa
+# streaming dari file, jadi puncak memori per ekspor tetap sebanding ukuran arsip. Arsip tidak di-cache: klik
+# ulang membangun ulang arsip, tetapi tidak ada arsip yang menetap di RAM/disk antar klik.
+def build_zip_bytes(df, nama_ttd, jabatan_ttd, no_nd_val, tgl_nd_val, with_pdf=False):
+    from docgen import generate_zip_files
+    with generate_zip_files(df, nama_ttd, jabatan_ttd, no_nd_val, tgl_nd_val, pdf_converter=convert_many if with_pdf else None) as arsip:
+        return arsip.read()
+
+def render():
+    """Render tab Generator. Return df_edited (roster hasil edit) atau None jika belum ada file."""
+    df_edited = None
+    c_up, c_ttd, c_nd = st.columns([1.5, 1.5, 1.5])
+    with c_up:
+        st.markdown("###### 1. Upload Data")
+        uploaded_file = st.file_uploader("Upload Excel/CSV Peserta", type=['xlsx', 'csv'], label_visibility="collapsed", key=f"uploader_{st.session_state['uploader_key']}")
+
+        sc1, sc2 = st.columns(2)
+        with sc1:
+            # Template baru dibuat (xlsxwriter) saat tombol diklik, lalu di-cache per proses (assets.py)
+            st.download_button("📥 Template Peserta", lambda: template_bytes('peserta'), template_file_name('peserta'), use_container_width=True)
+        with sc2:
+            if st.button("🔄 Reset", type="secondary", use_container_width=True): reset_app()
+
+    with c_ttd:
+        st.markdown("###### 2. Pejabat Tanda Tangan")
+        nama_ttd = st.text_input("Nama Pejabat", "Ayu Sukorini")
+        jabatan_ttd = st.text_input("Jabatan", "Sekretaris Direktorat Jenderal")
+
+    with c_nd:
+        st.markdown("###### 3. Detail Nota Dinas")
+        nomor_nd = st.text_input("Nomor ND", "[@NomorND]")
+        tanggal_nd = st.text_input("Tanggal ND", "[@TanggalND]")
+
+    st.divider()
+
+    if uploaded_file:
+        from ingest import load_roster
+        from history_mirror import annotate_prior_attendance
+        from storage import read_calendar, match_titles, refresh_history
+        try:
+            # Header dipetakan dulu (ingest.py), lalu hanya kolom NAMA/NIP/PANGKAT/SATKER/TEMPAT/JUDUL/TANGGAL yang dibaca
+            df_raw = load_roster(uploaded_file).fillna("-")
+
+            # Auto-Detect NIP
+            if 'NIP' in df_raw.columns:
+                nip_info = parse_nip_column(df_raw['NIP'])
+                df_raw['USIA'] = nip_info['USIA']; df_raw['GENDER'] = nip_info['GENDER']; df_raw['NIP_VALID'] = nip_info['NIP_VALID']
+                jml_invalid = int((~nip_info['NIP_VALID']).sum())
+                if jml_invalid: st.warning(f"⚠️ {jml_invalid} NIP tidak sesuai format 18 digit (cek kolom NIP_VALID).")
+            else:
+                df_raw['USIA'] = None; df_raw['GENDER'] = "Tidak Diketahui"
+
+            # Riwayat peserta (indeks NIP di mirror lokal log): tandai yang sudah pernah ikut diklat yang sama.
+            # Dihitung sekali per upload (file_id) lalu disimpan di session, supaya log dari download upload ini
+            # sendiri tidak membuat semua pesertanya tertandai PERNAH_IKUT di rerun berikutnya.
+            if 'NIP' in df_raw.columns:
+                riwayat = st.session_state.get('riwayat_upload')
+                if not riwayat or riwayat['file_id'] != uploaded_file.file_id or len(riwayat['kolom']) != len(df_raw):
+                    try: refresh_history()
+                    except Exception as e: st.warning(f"⚠️ Sinkronisasi log gagal, riwayat dihitung dari data lokal terakhir: {e}")
+                    kolom = annotate_prior_attendance(df_raw)[['PERNAH_IKUT', 'TERAKHIR_IKUT', 'JML_RIWAYAT']]
+                    riwayat = st.session_state['riwayat_upload'] = {'file_id': uploaded_file.file_id, 'kolom': kolom}
+                df_raw = df_raw.assign(**{c: riwayat['kolom'][c].to_numpy() for c in riwayat['kolom'].columns})
+                jml_ulang = int(df_raw['PERNAH_IKUT'].sum())
+                if jml_ulang: st.info(f"ℹ️ {jml_ulang} peserta sudah pernah mengikuti diklat yang sama (lihat kolom PERNAH_IKUT / TERAKHIR_IKUT).")
+
+            # Auto-Detect Title from Calendar: semua judul unik dicocokkan sekaligus (judul baku + kemiripan trigram).
+            # Hanya judul persis/normalisasi yang otomatis ditandai Selesai; kandidat mirip/saran harus dicentang user.
+            konfirmasi = {}
+            if 'JUDUL_PELATIHAN' in df_raw.columns:
+                try: data_cal = read_calendar()
+                except Exception as e:
+                    data_cal = pd.DataFrame()
+                    st.warning(f"⚠️ Kalender tidak bisa dibaca, status pelatihan tidak akan ditandai Selesai: {e}")
+                if not data_cal.empty:
+                    try:
+                        hasil_judul = match_titles(df_raw['JUDUL_PELATIHAN'].astype(str).unique().tolist(), data_cal)
+                        n_cocok = sum(h['id'] is not None for h in hasil_judul.values())
+                        kandidat = {j: h for j, h in hasil_judul.items() if h['id'] is None and h['kandidat_id'] is not None}
+                        if n_cocok == len(hasil_judul): st.success(f"✅ {n_cocok} judul pelatihan terdaftar di Kalender. Status akan diupdate setelah download.")
+                        elif kandidat: st.warning(f"⚠️ {n_cocok} dari {len(hasil_judul)} judul cocok dengan Kalender; {len(kandidat)} judul punya kandidat yang perlu dikonfirmasi di bawah.")
+                        elif n_cocok: st.warning(f"⚠️ {n_cocok} dari {len(hasil_judul)} judul cocok dengan Kalender; sisanya tidak akan ditandai Selesai.")
+                        else: st.warning("⚠️ Judul pelatihan tidak ditemukan di Kalender.")
+                        with st.expander("🔎 Pencocokan Judul ke Kalender", expanded=bool(kandidat) or n_cocok < len(hasil_judul)):
+                            df_match = pd.DataFrame([{'JUDUL_UPLOAD': j, 'JUDUL_KALENDER': h['judul_kalender'] or "-", 'ID': h['kandidat_id'] or "-",
+                                                      'KEYAKINAN': h['skor'], 'METODE': h['metode']} for j, h in hasil_judul.items()])
+                            st.dataframe(df_match, use_container_width=True, hide_index=True,
+                                         column_config={'KEYAKINAN': st.column_config.ProgressColumn("KEYAKINAN", format="percent", min_value=0, max_value=1)})
+                            if kandidat:
+                                st.markdown("###### Konfirmasi Kandidat")
+                                df_konf = pd.DataFrame([{'KONFIRMASI': False, 'JUDUL_UPLOAD': j, 'JUDUL_KALENDER': h['judul_kalender'], 'ID': h['kandidat_id'],
+                                                         'METODE': h['metode']} for j, h in kandidat.items()])
+                                df_konf = st.data_editor(df_konf, use_container_width=True, hide_index=True, disabled=['JUDUL_UPLOAD', 'JUDUL_KALENDER', 'ID', 'METODE'],
+                                                         key=f"konfirmasi_judul_{st.session_state['uploader_key']}")
+                                konfirmasi = dict(zip(df_konf.loc[df_konf['KONFIRMASI'], 'JUDUL_UPLOAD'], df_konf.loc[df_konf['KONFIRMASI'], 'ID']))
+                            st.caption("'mirip'/'saran' = hasil kemiripan judul, hanya ditandai Selesai jika dicentang. Angka/angkatan yang berbeda selalu 'saran'.")
+                    except KeyError as e: st.warning(f"⚠️ Kolom {e} tidak ada di Kalender; pencocokan judul dilewati.")
+                    except Exception as e: st.warning(f"⚠️ Pencocokan judul ke Kalender gagal, tidak ada jadwal yang ditandai Selesai lewat konfirmasi: {e}")
+
+            st.markdown("###### 4. Preview & Edit Data")
+            df_edited = st.data_editor(df_raw, num_rows="dynamic", use_container_width=True)
+
+            ts = datetime.datetime.now().strftime("%H%M%S")
+            # Dokumen baru dibuat saat tombol download diklik (bukan di setiap rerun)
+            doc_args = (df_edited, nama_ttd, jabatan_ttd, nomor_nd, tanggal_nd)
+
+            st.markdown("<br>", unsafe_allow_html=True)
+            ada_pdf = pdf_available(); info_pdf = None if ada_pdf else "LibreOffice (soffice) tidak ditemukan di server."
+            c_d1, c_d2, c_d3 = st.columns(3)
+            with c_d1:
+                st.download_button("📄 Download Lampiran ND (.docx)", lambda: build_word_bytes(*doc_args), f"Lampiran_{ts}.docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", type="primary", use_container_width=True, on_click=save_to_cloud_callback, args=(df_edited, konfirmasi, uploaded_file.file_id))
+            with c_d2:
+                st.download_button("📑 Download Lampiran ND (.pdf)", lambda: build_pdf_bytes(*doc_args), f"Lampiran_{ts}.pdf", "application/pdf", use_container_width=True, disabled=not ada_pdf, help=info_pdf, on_click=save_to_cloud_callback, args=(df_edited, konfirmasi, uploaded_file.file_id))
+            with c_d3:
+                zip_pdf = st.checkbox("Sertakan PDF di arsip ZIP", disabled=not ada_pdf, help=info_pdf)
+                st.download_button("📦 Download Arsip ZIP", lambda: build_zip_bytes(*doc_args, with_pdf=zip_pdf), f"Arsip_{ts}.zip", "application/zip", use_container_width=True, on_click=save_to_cloud_callback, args=(df_edited, konfirmasi, uploaded_file.file_id))
+            if ada_pdf and pdf_stats()['docs']:
+                stat = pdf_stats(); st.caption(f"Konversi PDF: {stat['docs']} dokumen, {stat['docs_per_sec']:.1f} dok/detik")
+
+            # Lampiran satu pelatihan saja (upload berisi beberapa judul)
+            if 'JUDUL_PELATIHAN' in df_edited.columns and df_edited['JUDUL_PELATIHAN'].nunique() > 1:
+                c_p1, c_p2 = st.columns([2, 1], vertical_alignment="bottom")
+                judul_pilih = c_p1.selectbox("Lampiran per pelatihan", sorted(df_edited['JUDUL_PELATIHAN'].dropna().unique().tolist()))
+                df_judul = df_edited[df_edited['JUDUL_PELATIHAN'] == judul_pilih]
+                nama_judul = "".join(ch if ch.isalnum() else "_" for ch in str(judul_pilih))[:60]
+                c_p2.download_button("📄 Lampiran Pelatihan Ini", lambda: build_word_bytes(df_judul, *doc_args[1:]), f"Lampiran_{nama_judul}_{ts}.docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", use_container_width=True, on_click=save_to_cloud_callback, args=(df_judul, konfirmasi, uploaded_file.file_id))
+
+        except Exception as e: st.error(f"Error: {e}")
+    else: st.info("👈 Silakan upload file Excel/CSV peserta.")
+    return df_edited
@@ -0,0 +1,65 @@
+import datetime
+
+import pandas as pd
+import streamlit as st
+
+from assets import template_bytes, template_file_name
+from ingest import load_calendar
+from storage import TUJUAN_SIMPAN, read_calendar, storage_status, upsert_calendar
+
+# =============================================================================
+# TAB KALENDER (DI-IMPORT & DIJALANKAN HANYA SAAT TAB DIBUKA)
+# =============================================================================
+def format_date_range(row):
+    try:
+        tgl_mulai = row['TANGGAL_MULAI']
+        tgl_selesai = row['TANGGAL_SELESAI']
+        if isinstance(tgl_mulai, (pd.Timestamp, datetime.datetime)): tgl_mulai = tgl_mulai.strftime("%d %b %Y")
+        if isinstance(tgl_selesai, (pd.Timestamp, datetime.datetime)): tgl_selesai = tgl_selesai.strftime("%d %b %Y")
+        str_mulai = str(tgl_mulai).strip(); str_selesai = str(tgl_selesai).strip()
+        return str_mulai if str_mulai == str_selesai else f"{str_mulai} s.d. {str_selesai}"
+    except: return "-"
+
+def update_calendar_db(df_new):
+    """Upsert kalender berbasis diff lewat storage.py (Sheets, SQLite lokal, atau antrian saat offline).
+    Return ringkasan {'inserted', 'updated', 'unchanged', 'duplicates'} atau False."""
+    try:
+        required = ['TANGGAL_MULAI', 'TANGGAL_SELESAI', 'LOKASI', 'JUDUL_PELATIHAN']
+        if not all(col in df_new.columns for col in required):
+            st.error(f"Excel harus punya kolom: {', '.join(required)}")
+            return False
+
+        df_new['RENCANA_TANGGAL'] = df_new.apply(format_date_range, axis=1)
+        df_new = df_new.astype(str)
+        summary, tujuan = upsert_calendar(list(zip(df_new['JUDUL_PELATIHAN'], df_new['RENCANA_TANGGAL'], df_new['LOKASI'])))
+        st.toast(f"✅ Kalender berhasil di-update{TUJUAN_SIMPAN[tujuan]}! {summary['inserted']} baru, {summary['updated']} diubah, {summary['unchanged']} tetap.", icon="📅")
+        return summary
+    except Exception as e:
+        st.error(f"Gagal update: {e}")
+        return False
+
+def render():
+    col_k1, col_k2 = st.columns([1, 2])
+    with col_k1:
+        st.subheader("Upload Kalender")
+        st.info("Format: JUDUL | TANGGAL_MULAI | TANGGAL_SELESAI | LOKASI")
+        file_kalender = st.file_uploader("Upload Excel/CSV Kalender", type=['xlsx', 'csv'])
+
+        # Template (bytes di-cache per proses, lihat assets.py)
+        st.download_button("📥 Template Kalender", lambda: template_bytes('kalender'), template_file_name('kalender'), use_container_width=True)
+
+        if file_kalender:
+            if st.button("Simpan / Update Kalender", type="primary"):
+                df_new_cal = load_calendar(file_kalender)
+                if 'JUDUL_PELATIHAN' in df_new_cal.columns:
+                    update_calendar_db(df_new_cal)
+                else: st.error("Format salah! Kolom JUDUL_PELATIHAN wajib ada.")
+
+    with col_k2:
+        st.subheader("Preview Master Kalender")
+        if storage_status()['offline']: st.caption("📴 Google Sheets tidak terjangkau — menampilkan salinan lokal terakhir.")
+        try:
+            data_cal = read_calendar()
+            if not data_cal.empty: st.dataframe(data_cal, use_container_width=True)
+            else: st.warning("Data kalender masih kosong.")
+        except: st.warning("Sheet 'Master_Kalender' belum dibuat di Google Sheets.")
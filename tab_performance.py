@@ -0,0 +1,36 @@
+import datetime
+
+import pandas as pd
+import streamlit as st
+
+from perf import recent_reruns, current_session, background_activity, span_summary, export_jsonl
+
+# =============================================================================
+# TAB PERFORMANCE / ADMIN (DI-IMPORT & DIJALANKAN HANYA SAAT TAB DIBUKA)
+# =============================================================================
+def render():
+    st.subheader("⏱️ Performance")
+    lingkup = st.radio("Lingkup", ["Sesi ini", "Semua sesi"], horizontal=True)
+    reruns = recent_reruns(None if lingkup == "Semua sesi" else current_session())
+    if not reruns: st.info("Belum ada rerun yang selesai tercatat (rerun yang sedang berjalan belum termasuk).")
+    else:
+        terakhir = reruns[-1]
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Rerun Terakhir", f"{terakhir['total_ms']:.0f} ms")
+        m2.metric("Panggilan API", sum(terakhir['api_calls'].values()))
+        m3.metric("Rerun Tercatat", len(reruns))
+        c_s1, c_s2 = st.columns([2, 1])
+        with c_s1:
+            st.markdown("###### Span Rerun Terakhir")
+            st.dataframe(pd.DataFrame(terakhir['spans']), use_container_width=True, hide_index=True)
+        with c_s2:
+            st.markdown("###### Panggilan API")
+            st.dataframe(pd.DataFrame(list(terakhir['api_calls'].items()), columns=['API', 'JUMLAH']), use_container_width=True, hide_index=True)
+        st.markdown("###### Ringkasan per Span")
+        st.dataframe(pd.DataFrame(span_summary(reruns)), use_container_width=True, hide_index=True)
+        st.line_chart(pd.DataFrame({'TOTAL_MS': [r['total_ms'] for r in reruns]}), height=200)
+        st.download_button("📥 Ekspor JSONL", export_jsonl(reruns), f"perf_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl", "application/x-ndjson")
+    with st.expander("Aktivitas Background (antrian tulis, worker)"):
+        bg = background_activity()
+        st.dataframe(pd.DataFrame(list(bg['api_calls'].items()), columns=['API', 'JUMLAH']), use_container_width=True, hide_index=True)
+        st.dataframe(pd.DataFrame(bg['spans'][-50:]), use_container_width=True, hide_index=True)
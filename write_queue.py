@@ -0,0 +1,172 @@
+import datetime
+import json
+import os
+import threading
+import time
+import uuid
+
+from perf import timed
+
+# =============================================================================
+# KONFIGURASI ANTRIAN TULIS (WRITE-BEHIND KE GOOGLE SHEETS)
+# =============================================================================
+QUEUE_DIR = os.environ.get("WRITE_QUEUE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".write_queue"))
+JOURNAL_FILE = os.path.join(QUEUE_DIR, "journal.jsonl")
+BATCH_WINDOW = 1.0      # detik menunggu job lain sebelum flush, supaya beberapa download jadi satu batch
+IDLE_INTERVAL = 30.0    # detik; worker tetap mengecek journal walau tidak dibangunkan
+MAX_BACKOFF = 300.0     # detik; jeda retry maksimum setelah gagal berturut-turut
+
+# =============================================================================
+# JOURNAL DI DISK (SATU JOB PER BARIS JSON)
+# =============================================================================
+def _load_journal():
+    jobs = []
+    if not os.path.exists(JOURNAL_FILE): return jobs
+    with open(JOURNAL_FILE, encoding="utf-8") as f:
+        for line in f:
+            try: jobs.append(json.loads(line))
+            except ValueError: pass   # baris terakhir terpotong (crash saat menulis) diabaikan
+    return jobs
+
+def _append_journal(job):
+    os.makedirs(QUEUE_DIR, exist_ok=True)
+    with open(JOURNAL_FILE, "a", encoding="utf-8") as f:
+        f.write(json.dumps(job, ensure_ascii=False, default=str) + "\n"); f.flush(); os.fsync(f.fileno())
+
+def _rewrite_journal(jobs):
+    os.makedirs(QUEUE_DIR, exist_ok=True)
+    tmp = JOURNAL_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for job in jobs: f.write(json.dumps(job, ensure_ascii=False, default=str) + "\n")
+        f.flush(); os.fsync(f.fileno())
+    os.replace(tmp, JOURNAL_FILE)
+
+# =============================================================================
+# WORKER (SATU THREAD PER PROSES)
+# =============================================================================
+# Jalur independen: urutan hanya penting di dalam satu jalur (log: append vs clear; kalender: upsert/selesai/reset).
+# Jalur yang gagal di-backoff sendiri sehingga kalender yang error tidak menahan log peserta, dan sebaliknya.
+JALUR = {'history': 'log', 'history_clear': 'log', 'completion': 'kalender', 'calendar_upsert': 'kalender', 'calendar_reset': 'kalender'}
+
+# Singleton modul (bukan st.cache_resource): "Clear cache" tidak boleh membuat antrian + thread kedua di journal yang sama
+_queue = {'lock': threading.Lock(), 'q': None}
+
+def _get_queue():
+    with _queue['lock']:
+        if _queue['q'] is None:
+            q = {'lock': threading.Lock(), 'flush_lock': threading.Lock(), 'wake': threading.Event(), 'jobs': _load_journal(),
+                 'lanes': {lane: {'failures': 0, 'next_try': 0.0, 'error': None} for lane in set(JALUR.values())},
+                 'last_flush': None, 'last_status': None}
+            threading.Thread(target=_worker, args=(q,), name="sheets-write-queue", daemon=True).start()
+            _queue['q'] = q
+        return _queue['q']
+
+def _worker(q):
+    while True:
+        if q['wake'].wait(timeout=IDLE_INTERVAL): time.sleep(BATCH_WINDOW)
+        q['wake'].clear()
+        try: _flush(q)
+        except Exception: pass   # status gagal sudah dicatat di _flush; worker tidak boleh mati
+
+def _runs(jobs):
+    runs = []
+    for job in jobs:
+        if runs and runs[-1][0]['kind'] == job['kind']: runs[-1].append(job)
+        else: runs.append([job])
+    return runs
+
+def _send(kind, run):
+    # gsheet (gspread/oauth2client) baru di-import di thread worker saat ada job, bukan saat app start
+    from gsheet import (append_history_rows, clear_history_sheet, mark_ids_complete, mark_trainings_complete, reset_calendar_status,
+                        upsert_calendar_rows)
+    if kind == 'history':
+        append_history_rows([row for j in run for row in j['rows']])
+        return f"{sum(len(j['rows']) for j in run)} baris log"
+    if kind == 'completion':
+        # ID hasil pencocokan saat upload; judul (job lama / kalender belum terbaca) dicocokkan ulang di Sheets
+        ids = [i for j in run for i in j.get('ids', [])]; titles = [t for j in run for t in j.get('titles', [])]
+        n = len(mark_ids_complete(ids)['matched']) if ids else 0
+        if titles: n += len(mark_trainings_complete(titles)['matched'])
+        return f"{n} jadwal ditandai Selesai"
+    if kind == 'calendar_upsert':
+        hasil = upsert_calendar_rows([tuple(r) for j in run for r in j['calendar']])
+        return f"kalender {hasil['inserted']} baru, {hasil['updated']} diubah"
+    if kind == 'calendar_reset': return f"{reset_calendar_status()} jadwal di-reset"
+    if kind == 'history_clear': clear_history_sheet(); return "log dikosongkan"
+    raise ValueError(f"Jenis job tidak dikenal: {kind}")
+
+@timed("queue.flush")
+def _flush(q):
+    with q['flush_lock']:
+        with q['lock']: jobs = list(q['jobs'])
+        if not jobs: return
+        done = set(); ringkasan = []
+        try:
+            for lane, state in q['lanes'].items():
+                if time.time() < state['next_try']: continue
+                try:
+                    # Per jalur: job dikirim sesuai urutan masuk, job berurutan dengan jenis sama digabung jadi satu panggilan;
+                    # berhenti di kegagalan pertama supaya urutan di jalur ini tetap terjaga
+                    for run in _runs([j for j in jobs if JALUR.get(j['kind']) == lane]):
+                        ringkasan.append(_send(run[0]['kind'], run))
+                        done.update(j['id'] for j in run)
+                    state.update(failures=0, next_try=0.0, error=None)
+                except Exception as e:
+                    state['failures'] += 1
+                    state.update(next_try=time.time() + min(MAX_BACKOFF, 2.0 ** state['failures']), error=f"{lane}: {e}")
+            gagal = [lane for lane, state in q['lanes'].items() if state['error']]
+            if not gagal: q['last_status'] = "OK: " + ", ".join(ringkasan)
+            else: q['last_status'] = f"Gagal ({', '.join(gagal)}), dicoba ulang otomatis" + (f"; OK: {', '.join(ringkasan)}" if ringkasan else "")
+        finally:
+            q['last_flush'] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            if done:
+                with q['lock']:
+                    q['jobs'] = [j for j in q['jobs'] if j['id'] not in done]
+                    _rewrite_journal(q['jobs'])
+
+# =============================================================================
+# API PUBLIK
+# =============================================================================
+def _enqueue(job):
+    q = _get_queue()
+    job.update(id=uuid.uuid4().hex, created=datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    with q['lock']:
+        _append_journal(job); q['jobs'].append(job)
+    q['wake'].set()
+
+def enqueue_history(rows):
+    """Antrikan baris log Sheet1; kembali seketika, dikirim worker dengan append_rows gabungan."""
+    if rows: _enqueue({'kind': 'history', 'rows': rows})
+
+def enqueue_completion(titles=(), ids=()):
+    """Antrikan jadwal yang ditandai Selesai di Master_Kalender, per ID kalender dan/atau judul (digabung jadi satu batch_update)."""
+    if titles or ids: _enqueue({'kind': 'completion', 'titles': list(titles), 'ids': [str(i) for i in ids]})
+
+# Dipakai mode offline (storage.py): perubahan lokal dikirim ulang ke Sheets saat koneksi kembali
+def enqueue_calendar_upsert(rows):
+    if rows: _enqueue({'kind': 'calendar_upsert', 'calendar': [list(r) for r in rows]})
+
+def enqueue_calendar_reset(): _enqueue({'kind': 'calendar_reset'})
+
+def enqueue_history_clear(): _enqueue({'kind': 'history_clear'})
+
+def start_queue_worker():
+    """Muat journal & jalankan worker (sekali per proses) supaya job tertunda dari proses sebelumnya langsung dikirim."""
+    _get_queue()
+
+def pending_kinds():
+    q = _get_queue()
+    with q['lock']: return {j['kind'] for j in q['jobs']}
+
+def flush_now():
+    q = _get_queue()
+    for state in q['lanes'].values(): state['next_try'] = 0.0
+    q['wake'].set()
+
+def queue_status():
+    q = _get_queue()
+    with q['lock']: jobs = list(q['jobs'])
+    gagal = [state for state in q['lanes'].values() if state['error']]
+    next_retry = max(0, int(min(state['next_try'] for state in gagal) - time.time())) if gagal else 0
+    return {'depth': len(jobs), 'rows': sum(len(j.get('rows', [])) for j in jobs), 'last_flush': q['last_flush'],
+            'last_status': q['last_status'], 'last_error': "; ".join(state['error'] for state in gagal) or None, 'next_retry': next_retry}